@@ -1,5 +1,792 @@
+import contextlib
+import cProfile
+import functools
+import logging
+import os
 import random
-import copy
+import struct
+import time
+import heapq
+import itertools
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from mmap import ACCESS_COPY, mmap as MemoryMap
+from multiprocessing.shared_memory import SharedMemory
+
+import raster
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est facultatif : les chemins vectorisés sont alors désactivés
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Bits du masque des directions ouvertes d'une cellule
+HAUT, BAS, GAUCHE, DROITE = 1, 2, 4, 8
+
+# Tables de traduction d'un plan de murs (0 = ouvert, 1 = mur) vers un bit de direction
+_OUVERT_VERS = {bit: bytes([bit]) + bytes(255) for bit in (HAUT, BAS, GAUCHE, DROITE)}
+# Table de traduction d'un masque de directions vers le nombre de directions ouvertes
+_DEGRE = bytes(bin(m).count("1") for m in range(256))
+
+
+def _main_droite(masque, cap):
+    """
+    Règle de la main droite : à partir du cap (0 haut, 1 droite, 2 bas, 3 gauche, sens horaire),
+    on essaie de tourner à droite, puis tout droit, à gauche et enfin demi-tour
+    :return: le nouveau cap, ou 4 si la cellule n'a aucune ouverture
+    """
+    bits = (HAUT, DROITE, BAS, GAUCHE)
+    for virage in (1, 0, 3, 2):
+        if masque & bits[(cap + virage) % 4]:
+            return (cap + virage) % 4
+    return 4
+
+
+# Table de la règle de la main droite, indexée par masque << 2 | cap
+_MAIN_DROITE = bytes(_main_droite(masque, cap) for masque in range(16) for cap in range(4))
+
+
+class _NeighborsView(Mapping):
+    """
+    Vue en lecture seule des voisinages d'un labyrinthe
+    Elle reproduit l'ancien dictionnaire {cellule: ensemble des voisines accessibles}
+    en le recalculant à la demande à partir des tableaux de murs ; les ensembles rendus
+    sont figés (frozenset), si bien qu'un ancien appelant qui les modifierait pour éditer
+    le labyrinthe échoue au lieu de perdre ses modifications en silence
+    (utiliser add_wall et remove_wall)
+    """
+    def __init__(self, maze):
+        self._maze = maze
+
+    def __getitem__(self, c):
+        if not (isinstance(c, tuple) and len(c) == 2 and
+                0 <= c[0] < self._maze.height and 0 <= c[1] < self._maze.width):
+            raise KeyError(c)
+        return frozenset(self._maze.get_reachable_cells(c))
+
+    def __iter__(self):
+        return ((i, j) for i in range(self._maze.height) for j in range(self._maze.width))
+
+    def __len__(self):
+        return self._maze.height * self._maze.width
+
+    def __repr__(self):
+        # Même affichage que l'ancien dictionnaire d'ensembles (utilisé par info)
+        return repr({c: set(voisines) for c, voisines in self.items()})
+
+
+class UnionFind:
+    """
+    Structure union-find (ensembles disjoints) sur les entiers 0..n-1
+    Les parents sont stockés dans un tableau d'entiers et les rangs dans un
+    tableau d'octets ; find compresse les chemins et union fusionne par rang
+    """
+    def __init__(self, n):
+        self.parent = array("i", _identite(n))
+        self.rank = bytearray(n)
+
+    def reset(self):
+        """
+        Cette méthode remet chaque élément dans son propre ensemble (sans réallouer)
+        :return: rien
+        """
+        self.parent[:] = _identite(len(self.parent))
+        self.rank[:] = bytes(len(self.rank))
+
+    def add(self):
+        """
+        Cette méthode ajoute un nouvel élément, seul dans son ensemble
+        :return: le nouvel élément
+        """
+        self.parent.append(len(self.parent))
+        self.rank.append(0)
+        return len(self.parent) - 1
+
+    def find(self, x):
+        """
+        Cette méthode retourne le représentant de l'ensemble qui contient x
+        :param x: un élément
+        :return: le représentant de son ensemble
+        """
+        parent = self.parent
+        racine = x
+        while parent[racine] != racine:
+            racine = parent[racine]
+        # Compression de chemin : tous les éléments parcourus pointent sur la racine
+        while parent[x] != racine:
+            parent[x], x = racine, parent[x]
+        return racine
+
+    def union(self, x, y):
+        """
+        Cette méthode fusionne les ensembles qui contiennent x et y
+        :param x: un élément
+        :param y: un autre élément
+        :return: True si les deux ensembles étaient distincts, False sinon
+        """
+        rx = self.find(x)
+        ry = self.find(y)
+        if rx == ry:
+            return False
+        rank = self.rank
+        if rank[rx] < rank[ry]:
+            rx, ry = ry, rx
+        self.parent[ry] = rx
+        if rank[rx] == rank[ry]:
+            rank[rx] += 1
+        return True
+
+
+class IndexableSet:
+    """
+    Ensemble d'entiers de 0 à n-1 qui permet de tirer un élément au hasard
+    et de retirer un élément en temps constant
+    Les éléments présents occupent le début du tableau elements,
+    position[x] donne l'indice de x dans ce tableau
+    """
+    def __init__(self, n):
+        self.elements = array("i", _identite(n))
+        self.position = array("i", _identite(n))
+        self.size = n
+
+    def reset(self):
+        """
+        Cette méthode remet tous les éléments 0..n-1 dans l'ensemble (sans réallouer)
+        :return: rien
+        """
+        self.size = len(self.elements)
+        self.elements[:] = _identite(self.size)
+        self.position[:] = _identite(self.size)
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, x):
+        return self.position[x] < self.size
+
+    def random_element(self, rng=random):
+        """
+        Cette méthode tire un élément de l'ensemble au hasard
+        :param rng: le générateur aléatoire à utiliser
+        :return: un élément de l'ensemble
+        """
+        return self.elements[rng.randrange(self.size)]
+
+    def remove(self, x):
+        """
+        Cette méthode retire x de l'ensemble en l'échangeant avec le dernier élément
+        :param x: l'élément à retirer (il doit être présent)
+        :return: rien
+        """
+        elements, position = self.elements, self.position
+        p = position[x]
+        self.size -= 1
+        dernier = elements[self.size]
+        elements[p] = dernier
+        position[dernier] = p
+        elements[self.size] = x
+        position[x] = self.size
+
+
+class DistanceCache:
+    """
+    Cache LRU des champs de distances d'un labyrinthe
+    Pour chaque cellule source (numéro de cellule), on conserve le couple
+    (distances, prédécesseurs) obtenu par un parcours en largeur complet
+    Le cache est vidé dès que le labyrinthe a été modifié
+    """
+    def __init__(self, capacity=8):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._champs = OrderedDict()
+        self._version = None
+
+    def __len__(self):
+        return len(self._champs)
+
+    def clear(self):
+        """
+        Cette méthode vide le cache
+        :return: rien
+        """
+        self._champs.clear()
+
+    def peek(self, maze, source):
+        """
+        Cette méthode renvoie le champ de source s'il est en cache, sans le calculer
+        :param maze: le labyrinthe
+        :param source: numéro de la cellule source
+        :return: le couple (distances, prédécesseurs) ou None
+        """
+        if self._version != maze._version:
+            self._champs.clear()
+            self._version = maze._version
+        champ = self._champs.get(source)
+        if champ is not None:
+            self._champs.move_to_end(source)
+            self.hits += 1
+        return champ
+
+    def get(self, maze, source):
+        """
+        Cette méthode renvoie le champ de distances de source, en le calculant si besoin
+        :param maze: le labyrinthe
+        :param source: numéro de la cellule source
+        :return: le couple (distances, prédécesseurs)
+        """
+        champ = self.peek(maze, source)
+        if champ is None:
+            self.misses += 1
+            champ = maze._bfs_field(source)
+            self._champs[source] = champ
+            if len(self._champs) > self.capacity:
+                self._champs.popitem(last=False)
+        return champ
+
+
+class MazeMetrics:
+    """
+    Indicateurs d'un labyrinthe calculés par Maze.metrics
+      - dead_end_number : nombre de culs-de-sac
+      - worst_path_len : longueur (en cellules) du plus long chemin du départ à une impasse
+      - diameter : longueur (en passages) du plus long plus court chemin entre deux cellules
+      - diameter_exact : False si diameter n'est qu'une borne inférieure (labyrinthe non parfait,
+        voir Maze.metrics)
+      - branching_factor : nombre moyen d'enfants des cellules internes de l'arbre de parcours
+      - histogram : {longueur du chemin du départ à une impasse : nombre d'impasses}
+      - perfect : True si le labyrinthe est parfait
+    """
+    def __init__(self, dead_end_number, worst_path_len, diameter, branching_factor, histogram, perfect,
+                 diameter_exact=True):
+        self.dead_end_number = dead_end_number
+        self.worst_path_len = worst_path_len
+        self.diameter = diameter
+        self.diameter_exact = diameter_exact
+        self.branching_factor = branching_factor
+        self.histogram = histogram
+        self.perfect = perfect
+
+    def __repr__(self):
+        return (f"MazeMetrics(dead_end_number={self.dead_end_number}, worst_path_len={self.worst_path_len}, "
+                f"diameter={self.diameter}{'' if self.diameter_exact else ' (lower bound)'}, branching_factor={self.branching_factor:.3f}, "
+                f"perfect={self.perfect})")
+
+
+class ConnectivityIndex:
+    """
+    Index de connexité incrémental d'un labyrinthe (voir Maze.track_connectivity)
+    Chaque cellule porte une étiquette et les étiquettes sont regroupées par un union-find :
+      - supprimer un mur fusionne les étiquettes des deux cellules
+      - ajouter un mur lance deux parcours alternés depuis ses deux côtés ; s'ils se
+        rejoignent rien ne change, sinon le parcours épuisé en premier (la plus petite
+        des deux parties) reçoit une nouvelle étiquette
+    Le coût d'une modification est donc proportionnel à la partie explorée
+    et non à la taille du labyrinthe
+    """
+    def __init__(self, maze):
+        self._maze = maze
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Cette méthode recalcule l'index à partir des murs (parcours de tout le labyrinthe)
+        :return: rien
+        """
+        maze = self._maze
+        n = maze.height * maze.width
+        self._etiquettes = array("i", [-1]) * n
+        nb = 0
+        for depart in range(n):
+            if self._etiquettes[depart] < 0:
+                self._etiquettes[depart] = nb
+                pile = [depart]
+                while pile:
+                    for v in self._voisines(pile.pop()):
+                        if self._etiquettes[v] < 0:
+                            self._etiquettes[v] = nb
+                            pile.append(v)
+                nb += 1
+        self._ensembles = UnionFind(nb)
+        self.version = maze._version
+
+    def _voisines(self, k):
+        """
+        :return: la liste des cellules accessibles depuis la cellule numéro k
+        """
+        maze = self._maze
+        w = maze.width
+        est, sud = maze._east, maze._south
+        voisines = []
+        if k >= w and not sud[k - w]:
+            voisines.append(k - w)
+        if not sud[k]:
+            voisines.append(k + w)
+        if k % w and not est[k - 1]:
+            voisines.append(k - 1)
+        if not est[k]:
+            voisines.append(k + 1)
+        return voisines
+
+    def connected(self, a, b):
+        """
+        Cette méthode indique si deux cellules sont reliées
+        :param a: numéro de la première cellule
+        :param b: numéro de la seconde cellule
+        :return: True si un chemin relie a et b
+        """
+        if self.version != self._maze._version:
+            self.rebuild()
+        return self._ensembles.find(self._etiquettes[a]) == self._ensembles.find(self._etiquettes[b])
+
+    def _wall_removed(self, a, b):
+        self._ensembles.union(self._etiquettes[a], self._etiquettes[b])
+
+    def _wall_added(self, a, b):
+        # Deux parcours en profondeur alternés, un pas chacun à tour de rôle
+        vus = ({a}, {b})
+        piles = ([a], [b])
+        while True:
+            for cote in (0, 1):
+                pile = piles[cote]
+                if not pile:
+                    # Ce côté est désormais une composante à part : nouvelle étiquette
+                    etiquette = self._ensembles.add()
+                    for k in vus[cote]:
+                        self._etiquettes[k] = etiquette
+                    return
+                autre = vus[1 - cote]
+                for v in self._voisines(pile.pop()):
+                    if v in autre:
+                        return  # les deux côtés sont toujours reliés
+                    if v not in vus[cote]:
+                        vus[cote].add(v)
+                        pile.append(v)
+
+
+class TreeIndex:
+    """
+    Index d'un labyrinthe parfait vu comme un arbre enraciné (voir Maze.build_tree_index)
+      - parent[k] : cellule parente de k (la racine est son propre parent)
+      - depth[k] : distance de k à la racine
+      - up[j][k] : ancêtre de k situé 2^j niveaux plus haut (remontée binaire)
+    Les cellules sont désignées par leur numéro l * width + c
+    """
+    def __init__(self, width, depth, parent, version):
+        self.width = width
+        self.depth = depth
+        self.parent = parent
+        self.version = version
+        self.up = [parent]
+        for _ in range(max(1, max(depth).bit_length()) - 1):
+            precedent = self.up[-1]
+            if np is not None:
+                indices = np.frombuffer(precedent, dtype=np.int32)
+                self.up.append(array("i", indices[indices].tobytes()))
+            else:
+                self.up.append(array("i", map(precedent.__getitem__, precedent)))
+
+    def lca(self, a, b):
+        """
+        Cette méthode calcule le plus proche ancêtre commun de deux cellules en O(log n)
+        :param a: numéro de la première cellule
+        :param b: numéro de la seconde cellule
+        :return: numéro de l'ancêtre commun
+        """
+        depth, up = self.depth, self.up
+        if depth[a] < depth[b]:
+            a, b = b, a
+        a = self.ancestor(a, depth[a] - depth[b])
+        if a == b:
+            return a
+        for niveau in reversed(up):
+            if niveau[a] != niveau[b]:
+                a, b = niveau[a], niveau[b]
+        return self.parent[a]
+
+    def ancestor(self, k, steps):
+        """
+        :return: l'ancêtre de la cellule k situé steps niveaux plus haut (O(log n))
+        """
+        j = 0
+        while steps:
+            if steps & 1:
+                k = self.up[j][k]
+            steps >>= 1
+            j += 1
+        return k
+
+    def distance(self, a, b):
+        """
+        :return: la longueur du chemin entre les cellules a et b
+        """
+        return self.depth[a] + self.depth[b] - 2 * self.depth[self.lca(a, b)]
+
+    def path(self, a, b):
+        """
+        Cette méthode donne le chemin entre deux cellules en O(longueur du chemin)
+        :return: la liste des numéros des cellules de a à b
+        """
+        ancetre = self.lca(a, b)
+        parent = self.parent
+        montee = [a]
+        while montee[-1] != ancetre:
+            montee.append(parent[montee[-1]])
+        descente = [b]
+        while descente[-1] != ancetre:
+            descente.append(parent[descente[-1]])
+        descente.pop()
+        descente.reverse()
+        return montee + descente
+
+    def distances(self, pairs):
+        """
+        Calcule les distances d'un grand nombre de paires de cellules
+        :param pairs: liste de couples de cellules ((l1, c1), (l2, c2)),
+                      ou tableau NumPy d'entiers de forme (m, 2) contenant des numéros de cellules
+        :return: la liste des distances, ou un tableau NumPy si pairs en est un
+        """
+        if np is not None and isinstance(pairs, np.ndarray):
+            return self._distances_numpy(pairs)
+        w = self.width
+        return [self.distance(c1[0] * w + c1[1], c2[0] * w + c2[1]) for c1, c2 in pairs]
+
+    def _distances_numpy(self, pairs):
+        # Remontée binaire appliquée à toutes les paires à la fois
+        depth = np.frombuffer(self.depth, dtype=np.int32)
+        up = [np.frombuffer(niveau, dtype=np.int32) for niveau in self.up]
+        a = pairs[:, 0].astype(np.int64)
+        b = pairs[:, 1].astype(np.int64)
+        da, db = depth[a], depth[b]
+        echange = da < db
+        a, b = np.where(echange, b, a), np.where(echange, a, b)
+        ecart = np.abs(da - db)
+        for j, niveau in enumerate(up):
+            a = np.where((ecart >> j) & 1 == 1, niveau[a], a)
+        egaux = a == b
+        for niveau in reversed(up):
+            na, nb = niveau[a], niveau[b]
+            different = na != nb
+            a = np.where(different, na, a)
+            b = np.where(different, nb, b)
+        ancetre = np.where(egaux, a, up[0][a])
+        return da + db - 2 * depth[ancetre]
+
+
+class _LinkCutTree:
+    """
+    Forêt dynamique (arbres link-cut de Sleator et Tarjan) utilisée par Maze.improve
+    Chaque chemin préféré de l'arbre est rangé, par profondeur croissante, dans un arbre
+    binaire auto-ajustant (splay) ; pere[k] est le père de k dans cet arbre binaire ou,
+    à la racine de celui-ci, le père du haut du chemin dans l'arbre du labyrinthe
+    expose(k) fait du chemin de la racine à k le chemin courant, sur lequel rank et select
+    donnent la profondeur d'une cellule et la cellule d'une profondeur donnée ;
+    toutes les opérations coûtent O(log n) amorti : un échange de passages ne demande aucun parcours
+    Les cellules sont désignées par leur numéro ; le numéro n sert de sentinelle (vide)
+    """
+    def __init__(self, parent, root):
+        """
+        :param parent: parent de chaque cellule (voir TreeIndex.parent)
+        :param root: numéro de la racine
+        """
+        n = len(parent)
+        self.vide = n
+        self.pere = list(parent) + [n]
+        self.pere[root] = n
+        self.gauche = [n] * (n + 1)
+        self.droite = [n] * (n + 1)
+        self.taille = [1] * n + [0]
+        self.inverse = bytearray(n + 1)
+        self.chemin = root
+
+    def _pousser(self, k):
+        # Propage l'inversion en attente (changement de racine) aux enfants
+        g, d = self.gauche[k], self.droite[k]
+        self.gauche[k], self.droite[k] = d, g
+        self.inverse[g] ^= 1
+        self.inverse[d] ^= 1
+        self.inverse[k] = 0
+
+    def _splay(self, x):
+        pere, gauche, droite, taille, inverse = self.pere, self.gauche, self.droite, self.taille, self.inverse
+        # Inversions en attente, de la racine de l'arbre binaire jusqu'à x
+        pile = [x]
+        p = pere[x]
+        while gauche[p] == pile[-1] or droite[p] == pile[-1]:
+            pile.append(p)
+            p = pere[p]
+        for y in reversed(pile):
+            if inverse[y]:
+                self._pousser(y)
+        while len(pile) > 1:
+            p = pere[x]
+            if len(pile) == 2:
+                rotations = (x,)
+            elif (gauche[pere[p]] == p) == (gauche[p] == x):
+                rotations = (p, x)  # zig-zig : rotation du père d'abord
+            else:
+                rotations = (x, x)  # zig-zag
+            del pile[-len(rotations):]
+            for t in rotations:
+                # Rotation de t au-dessus de son père
+                p = pere[t]
+                g = pere[p]
+                if gauche[g] == p:
+                    gauche[g] = t
+                elif droite[g] == p:
+                    droite[g] = t
+                pere[t] = g
+                if gauche[p] == t:
+                    b = droite[t]
+                    gauche[p] = b
+                    droite[t] = p
+                else:
+                    b = gauche[t]
+                    droite[p] = b
+                    gauche[t] = p
+                pere[b] = p
+                pere[p] = t
+                taille[p] = 1 + taille[gauche[p]] + taille[droite[p]]
+                taille[t] = 1 + taille[gauche[t]] + taille[droite[t]]
+
+    def expose(self, k):
+        """
+        Fait du chemin de la racine à la cellule k le chemin courant
+        :return: la dernière cellule où le chemin a été raccordé : après expose(a),
+                 expose(b) rend le plus proche ancêtre commun de a et b
+        """
+        pere, gauche, droite, taille = self.pere, self.gauche, self.droite, self.taille
+        vide = dernier = self.vide
+        y = k
+        while y != vide:
+            self._splay(y)
+            droite[y] = dernier
+            taille[y] = 1 + taille[gauche[y]] + taille[dernier]
+            dernier = y
+            y = pere[y]
+        self._splay(k)
+        self.chemin = k
+        return dernier
+
+    def rank(self, k):
+        """
+        :param k: une cellule du chemin courant
+        :return: la profondeur de k
+        """
+        self._splay(k)
+        self.chemin = k
+        return self.taille[self.gauche[k]]
+
+    def select(self, d):
+        """
+        :param d: une profondeur, au plus celle du bout du chemin courant
+        :return: la cellule du chemin courant située à la profondeur d
+        """
+        gauche, droite, taille, inverse = self.gauche, self.droite, self.taille, self.inverse
+        x = self.chemin
+        while True:
+            if inverse[x]:
+                self._pousser(x)
+            g = gauche[x]
+            if d < taille[g]:
+                x = g
+            elif d == taille[g]:
+                break
+            else:
+                d -= taille[g] + 1
+                x = droite[x]
+        self._splay(x)
+        self.chemin = x
+        return x
+
+    def cut(self, k):
+        """
+        Détache la cellule k (et son sous-arbre) de son parent
+        """
+        self.expose(k)
+        g = self.gauche[k]
+        self.pere[g] = self.vide
+        self.gauche[k] = self.vide
+        self.taille[k] -= self.taille[g]
+
+    def link(self, k, parent):
+        """
+        Rattache la cellule k, qui devient la racine de son arbre, à la cellule parent
+        """
+        self.expose(k)
+        self.inverse[k] ^= 1
+        self.pere[k] = parent
+
+
+class MazeSnapshot:
+    """
+    État des murs d'un labyrinthe à un instant donné (voir Maze.snapshot)
+    Les plans de murs sont conservés sous forme d'octets immuables :
+    un instantané peut être restauré autant de fois que nécessaire
+    """
+    __slots__ = ("height", "width", "east", "south", "generator", "seed")
+
+    def __init__(self, height, width, east, south, generator, seed):
+        self.height = height
+        self.width = width
+        self.east = east
+        self.south = south
+        self.generator = generator
+        self.seed = seed
+
+    def __repr__(self):
+        return f"MazeSnapshot({self.height}x{self.width}, generator={self.generator!r})"
+
+
+class MazeProfile:
+    """
+    Statistiques collectées par maze_profiler
+      - walls : nombre d'appels à add_wall et remove_wall
+      - expanded : nombre de cellules développées par méthode de résolution
+      - random_draws : nombre de tirages aléatoires par générateur
+      - phases : durée cumulée (s) de chaque phase, clés "méthode.phase"
+      - calls / seconds : nombre d'appels et durée cumulée des méthodes instrumentées
+      - fast_mode : True si les vérifications de add_wall / remove_wall étaient désactivées
+      - cprofile_files : fichiers pstats écrits (un par appel de premier niveau)
+    """
+    def __init__(self, cprofile_dir=None):
+        self.walls = {"add_wall": 0, "remove_wall": 0}
+        self.expanded = {}
+        self.random_draws = {}
+        self.phases = {}
+        self.calls = {}
+        self.seconds = {}
+        self.fast_mode = not Maze.checks
+        self.cprofile_files = []
+        self._cprofile_dir = cprofile_dir
+        self._pile = []
+
+    def _ajouter(self, compteurs, cle, valeur):
+        compteurs[cle] = compteurs.get(cle, 0) + valeur
+
+    def as_dict(self):
+        """
+        :return: les statistiques sous forme de dictionnaire (sérialisable en JSON)
+        """
+        return {
+            "walls": dict(self.walls),
+            "expanded": dict(self.expanded),
+            "random_draws": dict(self.random_draws),
+            "phases": dict(self.phases),
+            "calls": dict(self.calls),
+            "seconds": dict(self.seconds),
+            "fast_mode": self.fast_mode,
+            "cprofile_files": list(self.cprofile_files),
+        }
+
+    def __repr__(self):
+        return f"MazeProfile({self.as_dict()})"
+
+
+# Profil actif (None quand l'instrumentation est désactivée)
+_profiler = None
+
+
+@contextlib.contextmanager
+def maze_profiler(cprofile_dir=None):
+    """
+    Active l'instrumentation de Maze le temps d'un bloc with
+        with maze_profiler() as p:
+            Maze.gen_fusion(100, 100)
+        print(p.phases)
+    :param cprofile_dir: répertoire où écrire un fichier pstats par appel instrumenté
+                         de premier niveau (None : pas de cProfile)
+    :return: le MazeProfile rempli pendant le bloc
+    """
+    global _profiler
+    precedent = _profiler
+    profil = MazeProfile(cprofile_dir)
+    _profiler = profil
+    try:
+        yield profil
+    finally:
+        profil.fast_mode = profil.fast_mode or not Maze.checks
+        _profiler = precedent
+
+
+def _phase(methode, nom):
+    """
+    :return: un gestionnaire de contexte qui chronomètre la phase nom de methode si l'instrumentation est active
+    """
+    if _profiler is None:
+        return contextlib.nullcontext()
+    return _ChronoPhase(_profiler, methode + "." + nom)
+
+
+class _ChronoPhase:
+    def __init__(self, profil, cle):
+        self._profil = profil
+        self._cle = cle
+
+    def __enter__(self):
+        self._debut = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self._profil._ajouter(self._profil.phases, self._cle, time.perf_counter() - self._debut)
+
+
+def _instrumented(nom):
+    """
+    Décorateur des méthodes instrumentées : compte les appels, mesure leur durée et,
+    si demandé, enregistre un profil cProfile pour chaque appel de premier niveau
+    Quand l'instrumentation est désactivée, le seul coût est un test par appel
+    """
+    def decorateur(fonction):
+        @functools.wraps(fonction)
+        def enveloppe(*args, **kwargs):
+            profil = _profiler
+            if profil is None:
+                return fonction(*args, **kwargs)
+            profil._pile.append(nom)
+            cprof = None
+            if profil._cprofile_dir is not None and len(profil._pile) == 1:
+                cprof = cProfile.Profile()
+                cprof.enable()
+            debut = time.perf_counter()
+            try:
+                return fonction(*args, **kwargs)
+            finally:
+                duree = time.perf_counter() - debut
+                if cprof is not None:
+                    cprof.disable()
+                    chemin = os.path.join(profil._cprofile_dir, f"{nom}-{len(profil.cprofile_files)}.prof")
+                    cprof.dump_stats(chemin)
+                    profil.cprofile_files.append(chemin)
+                profil._pile.pop()
+                profil._ajouter(profil.calls, nom, 1)
+                profil._ajouter(profil.seconds, nom, duree)
+        return enveloppe
+    return decorateur
+
+
+class _CountingRandom(random.Random):
+    """
+    Générateur aléatoire qui délègue à un autre générateur en comptant les tirages
+    (choice, randrange, shuffle... passent par getrandbits, comme pour random.Random,
+    si bien que la suite produite est identique à celle du générateur délégué)
+    """
+    def __init__(self, interne, profil, nom):
+        super().__init__()
+        self._interne = interne
+        self._profil = profil
+        self._nom = nom
+
+    def random(self):
+        self._profil._ajouter(self._profil.random_draws, self._nom, 1)
+        return self._interne.random()
+
+    def getrandbits(self, k):
+        self._profil._ajouter(self._profil.random_draws, self._nom, 1)
+        return self._interne.getrandbits(k)
 
 
 class Maze:
@@ -7,20 +794,70 @@ class Maze:
     Classe Labyrinthe
     Représentation sous forme de graphe non-orienté
     dont chaque sommet est une cellule (un tuple (l,c))
-    et dont la structure est représentée par un dictionnaire
+    Les murs sont stockés dans deux tableaux d'octets indexés par
+    le numéro de cellule k = l * width + c :
+      - _east[k] vaut 1 s'il y a un mur entre la cellule k et sa voisine de droite
+      - _south[k] vaut 1 s'il y a un mur entre la cellule k et sa voisine du dessous
+    Les murs extérieurs (dernière colonne pour _east, dernière ligne pour _south)
+    sont toujours présents.
+    L'attribut neighbors reste disponible sous la forme d'une vue en lecture
+    seule qui se comporte comme l'ancien dictionnaire
       - clés : sommets
       - valeurs : ensemble des sommets voisins accessibles
     """
+    # Vérification des coordonnées dans add_wall / remove_wall ; mettre à False
+    # (mode rapide, voir set_fast_mode) pour supprimer ces tests des boucles critiques
+    checks = True
+
     def __init__(self, height, width):
         """
         Constructeur d'un labyrinthe de height cellules de haut
         et de width cellules de large
-        Les voisinages sont initialisés à des ensembles vides
+        Les deux tableaux de murs sont initialisés à 1
         Remarque : dans le labyrinthe créé, chaque cellule est complètement emmurée
         """
         self.height = height
         self.width = width
-        self.neighbors = {(i,j): set() for i in range(height) for j in range (width)}
+        self._east = bytearray(b"\x01") * (height * width)
+        self._south = bytearray(b"\x01") * (height * width)
+        # Compteur de modifications, utilisé pour invalider les structures précalculées
+        self._version = 0
+        self._adjacence = None
+        self.solve_stats = None
+        self.improve_stats = None
+        self.distances = DistanceCache()
+        self._connectivity = None
+        self._tree_index = None
+        # Journal des modifications de murs (a, b, ajout) pour undo, None s'il n'est pas tenu
+        self._journal = None
+        # Algorithme et graine qui ont produit le labyrinthe, s'ils sont connus
+        self.generator = None
+        self.seed = None
+
+    def __getattr__(self, nom):
+        """
+        Décode les murs d'un labyrinthe chargé par projection en mémoire (voir load)
+        au premier accès à _east ou _south ; les accès suivants lisent des tableaux d'octets
+        """
+        planes = self.__dict__.get("_mapped_planes")
+        if planes is None or nom not in ("_east", "_south"):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {nom!r}")
+        del self._mapped_planes
+        self._east, self._south = _close_border(*planes.decode(), self.height, self.width)
+        return getattr(self, nom)
+
+    def __getstate__(self):
+        # Une projection en mémoire ne se sérialise pas : les murs sont décodés avant
+        self._east
+        return self.__dict__
+
+    @property
+    def neighbors(self):
+        """
+        Vue de compatibilité sur les murs, indexable comme l'ancien dictionnaire
+        de voisinages : neighbors[c] est l'ensemble des cellules accessibles depuis c
+        """
+        return _NeighborsView(self)
 
     def info(self):
         """
@@ -47,38 +884,70 @@ class Maze:
 
     def __str__(self):
         """
-        **NE PAS MODIFIER CETTE MÉTHODE**
         Représentation textuelle d'un objet Maze (en utilisant des caractères ascii)
         Retour:
              chaîne (str) : chaîne de caractères représentant le labyrinthe
         """
-        txt = ""
-        # Première ligne
-        txt += "┏"
-        for j in range(self.width-1):
-            txt += "━━━┳"
-        txt += "━━━┓\n"
-        txt += "┃"
-        for j in range(self.width-1):
-            txt += "   ┃" if (0,j+1) not in self.neighbors[(0,j)] else "    "
-        txt += "   ┃\n"
-        # Lignes normales
-        for i in range(self.height-1):
-            txt += "┣"
-            for j in range(self.width-1):
-                txt += "━━━╋" if (i+1,j) not in self.neighbors[(i,j)] else "   ╋"
-            txt += "━━━┫\n" if (i+1,self.width-1) not in self.neighbors[(i,self.width-1)] else "   ┫\n"
-            txt += "┃"
-            for j in range(self.width):
-                txt += "   ┃" if (i+1,j+1) not in self.neighbors[(i+1,j)] else "    "
-            txt += "\n"
-        # Bas du tableau
-        txt += "┗"
-        for i in range(self.width-1):
-            txt += "━━━┻"
-        txt += "━━━┛\n"
+        return "".join(self.iter_lines())
 
-        return txt
+    def _rows(self):
+        """
+        Générateur des lignes de murs du labyrinthe
+        :return: pour chaque ligne, le couple (murs est, murs sud) sous forme d'octets
+        """
+        w = self.width
+        for debut in range(0, self.height * w, w):
+            yield self._east[debut:debut + w], self._south[debut:debut + w]
+
+    def iter_lines(self, content=None):
+        """
+        Générateur des lignes du rendu texte du labyrinthe, construites une par une
+        :param content: dictionnaire facultatif tq content[cell] contient le caractère
+                        à afficher au milieu de la cellule
+        :return: les lignes de texte (terminées par un retour à la ligne)
+        """
+        return _render_lines(self.width, self._rows(), content)
+
+    def render_to(self, stream, content=None):
+        """
+        Écrit le rendu texte du labyrinthe ligne par ligne dans un flux
+        (seule une ligne du dessin est en mémoire à la fois)
+        :param stream: objet fichier ouvert en mode texte
+        :param content: dictionnaire facultatif du contenu des cellules (voir overlay)
+        :return: rien
+        """
+        write = stream.write
+        for ligne in self.iter_lines(content):
+            write(ligne)
+
+    def _wall(self, c1, c2):
+        """
+        Cette méthode localise le mur entre deux cellules contiguës
+        :param c1: la cellule 1
+        :param c2: la cellule 2
+        :return: le couple (tableau de murs, indice) qui contient ce mur
+        """
+        if c1 > c2:
+            c1, c2 = c2, c1
+        k = c1[0] * self.width + c1[1]
+        if c2[0] == c1[0] and c2[1] == c1[1] + 1:
+            return self._east, k
+        if self.checks:
+            assert c2[0] == c1[0] + 1 and c2[1] == c1[1], \
+                f"Les cellules {c1} et {c2} ne sont pas contiguës"
+        return self._south, k
+
+    @classmethod
+    def set_fast_mode(cls, enabled=True):
+        """
+        Active ou désactive le mode rapide : add_wall et remove_wall ne vérifient plus
+        que les cellules sont dans le labyrinthe et contiguës (l'appelant en est responsable)
+        :param enabled: True pour activer le mode rapide
+        :return: rien
+        """
+        cls.checks = not enabled
+        if _profiler is not None and enabled:
+            _profiler.fast_mode = True
 
     def add_wall(self, c1, c2):
         """
@@ -88,16 +957,19 @@ class Maze:
         :return: rien
         """
         # Facultatif : on teste si les sommets sont bien dans le labyrinthe
-        assert 0 <= c1[0] < self.height and \
-               0 <= c1[1] < self.width and \
-               0 <= c2[0] < self.height and \
-               0 <= c2[1] < self.width, \
-            f"Erreur lors de l'ajout d'un mur entre {c1} et {c2} : les coordonnées de sont pas compatibles avec les dimensions du labyrinthe"
+        if self.checks:
+            assert 0 <= c1[0] < self.height and \
+                   0 <= c1[1] < self.width and \
+                   0 <= c2[0] < self.height and \
+                   0 <= c2[1] < self.width, \
+                f"Erreur lors de l'ajout d'un mur entre {c1} et {c2} : les coordonnées de sont pas compatibles avec les dimensions du labyrinthe"
+        if _profiler is not None:
+            _profiler.walls["add_wall"] += 1
         # Ajout du mur
-        if c2 in self.neighbors[c1]:  # Si c2 est dans les voisines de c1
-            self.neighbors[c1].remove(c2)  # on le retire
-        if c1 in self.neighbors[c2]:  # Si c3 est dans les voisines de c2
-            self.neighbors[c2].remove(c1)  # on le retire
+        murs, k = self._wall(c1, c2)
+        if not murs[k]:
+            murs[k] = 1
+            self._edited(k, k + 1 if murs is self._east else k + self.width, True)
 
     def get_cells(self):
         """
@@ -118,16 +990,56 @@ class Maze:
         :return: rien
         """
         # Facultatif : on teste si les sommets sont bien dans le labyrinthe
-        assert 0 <= c1[0] < self.height and \
-               0 <= c1[1] < self.width and \
-               0 <= c2[0] < self.height and \
-               0 <= c2[1] < self.width, \
-            f"Impossible de supprimer un mur entre {c1} et {c2} : les coordonnées de sont pas compatibles avec les dimensions du labyrinthe"
+        if self.checks:
+            assert 0 <= c1[0] < self.height and \
+                   0 <= c1[1] < self.width and \
+                   0 <= c2[0] < self.height and \
+                   0 <= c2[1] < self.width, \
+                f"Impossible de supprimer un mur entre {c1} et {c2} : les coordonnées de sont pas compatibles avec les dimensions du labyrinthe"
+        if _profiler is not None:
+            _profiler.walls["remove_wall"] += 1
         # Suppresion du mur
-        if not(c2 in self.neighbors[c1]):  # Si c2 n'est pas dans les voisines de c1
-            self.neighbors[c1].add(c2)  # on le rajoute
-        if not(c1 in self.neighbors[c2]):  # Si c3 n'est pas dans les voisines de c2
-            self.neighbors[c2].add(c1)  # on le rajoute
+        murs, k = self._wall(c1, c2)
+        if murs[k]:
+            murs[k] = 0
+            self._edited(k, k + 1 if murs is self._east else k + self.width, False)
+
+    def _edited(self, a, b, ajout):
+        """
+        Enregistre la modification du mur entre les cellules numéros a et b (a < b),
+        met à jour sur place le masque d'adjacence s'il était à jour
+        et l'index de connexité s'il est suivi
+        :param ajout: True si le mur a été ajouté, False s'il a été supprimé
+        """
+        self._version += 1
+        if self._journal is not None:
+            self._journal.append((a, b, ajout))
+        if self._adjacence is not None and self._adjacence[0] == self._version - 1:
+            masque = self._adjacence[1]
+            bit_a, bit_b = (DROITE, GAUCHE) if b == a + 1 and a % self.width != self.width - 1 else (BAS, HAUT)
+            if ajout:
+                masque[a] &= ~bit_a
+                masque[b] &= ~bit_b
+            else:
+                masque[a] |= bit_a
+                masque[b] |= bit_b
+            self._adjacence = (self._version, masque)
+        index = self._connectivity
+        if index is not None and index.version == self._version - 1:
+            if ajout:
+                index._wall_added(a, b)
+            else:
+                index._wall_removed(a, b)
+            index.version = self._version
+
+    def _bulk_edited(self):
+        """
+        Enregistre le remplacement des tableaux de murs (fill, empty, restore) :
+        les structures précalculées sont invalidées et le journal ne peut plus être rejoué
+        """
+        self._version += 1
+        if self._journal is not None:
+            self._journal.clear()
 
     def get_walls(self) -> list:
         """
@@ -135,13 +1047,15 @@ class Maze:
         :return: la liste des murs sous forme d'une liste de listes de tuples
         """
         walls = []
+        k = 0
         for ligne in range(self.height):
             for col in range(self.width):
                 cell = (ligne, col)
-                if col + 1 < self.width and not ((ligne, col + 1) in self.neighbors[cell]):
+                if col + 1 < self.width and self._east[k]:
                     walls.append([cell, (ligne, col + 1)])
-                if ligne + 1 < self.height and not ((ligne + 1, col) in self.neighbors[cell]):
+                if ligne + 1 < self.height and self._south[k]:
                     walls.append([cell, (ligne + 1, col)])
+                k += 1
         return walls
 
     def fill(self)->None:
@@ -149,23 +1063,22 @@ class Maze:
         Cette méthode rajoute tous les murs possibles au labyrinthe
         :return: rien
         """
-        for i in range(self.width):
-            for j in range(self.height):
-                self.neighbors[(i, j)] = set()
+        n = self.height * self.width
+        self._east = bytearray(b"\x01") * n
+        self._south = bytearray(b"\x01") * n
+        self._bulk_edited()
         return None
 
     def empty(self):
         """
         Cette méthode Supprime tous les murs dans le labyrinthe
+        (seuls les murs extérieurs sont conservés)
         :return: rien
         """
-        for i in range(self.height):
-            for j in range(self.width):
-                # Supprime de murs vers la droite et vers le bas
-                if j + 1 < self.width:
-                    self.remove_wall((i, j), (i, j + 1))
-                if i + 1 < self.height:
-                    self.remove_wall((i, j), (i + 1, j))
+        h, w = self.height, self.width
+        self._east = bytearray(b"\x00" * (w - 1) + b"\x01") * h
+        self._south = bytearray(w * (h - 1)) + bytearray(b"\x01") * w
+        self._bulk_edited()
 
     def get_contiguous_cells(self, c)->list:
         """
@@ -190,29 +1103,51 @@ class Maze:
         :param c: la cellule dont on veut savoir les cellules accessibles
         :return: la liste des cellules accessibles depuis c
         """
+        i, j = c
+        w = self.width
+        k = i * w + j
         reachable = []
-        contiguousCells = self.get_contiguous_cells(c)
-        for cell in contiguousCells:
-            if cell in self.neighbors[c]:
-                reachable.append(cell)
+        if i > 0 and not self._south[k - w]:
+            reachable.append((i - 1, j))
+        if not self._south[k]:
+            reachable.append((i + 1, j))
+        if j > 0 and not self._east[k - 1]:
+            reachable.append((i, j - 1))
+        if not self._east[k]:
+            reachable.append((i, j + 1))
 
         return reachable
 
     @classmethod
-    def gen_btree(cls, h, w):
+    @_instrumented("gen_btree")
+    def gen_btree(cls, h, w, seed=None, vectorized=None):
         """
         Méthode de classe pour générer un labyrinthe à h lignes et w colonnes
         en utilisant l'algorithme de construction par arbre binaire.
+        Les tirages d'une ligne sont faits en une fois (un bit par cellule : 1 pour EST, 0 pour SUD),
+        ce qui permet à la version NumPy de produire exactement le même labyrinthe
         :param h: la hauteur du labyrinthe
         :param w: la largeur du labyrinthe
+        :param seed: graine (entier) ou instance de random.Random ; None utilise le module random
+        :param vectorized: True pour utiliser NumPy, False pour la version Python,
+                           None pour utiliser NumPy s'il est installé
         :return: le nouveau labyrinthe
         """
+        rng = _rng(seed)
         maze = cls(h, w)
+        maze.generator = "btree"
+        maze.seed = seed if isinstance(seed, int) else None
+        if _use_numpy(vectorized):
+            _btree_numpy(maze, rng)
+            return maze
+        est, sud = maze._east, maze._south
 
         for i in range(h):
+            if i < h - 1:
+                tirage = format(rng.getrandbits(w - 1), "0%db" % (w - 1))[::-1] if w > 1 else ""
             for j in range(w):
                 if i < h - 1 and j < w - 1:
-                    direction = random.choice(["EST", "SUD"])
+                    direction = "EST" if tirage[j] == "1" else "SUD"
                 elif i < h - 1:
                     direction = "SUD"
                 elif j < w - 1:
@@ -221,182 +1156,300 @@ class Maze:
                     direction = None
 
                 if direction == "EST":
-                    maze.remove_wall((i, j), (i, j + 1))
+                    est[i * w + j] = 0
                 elif direction == "SUD":
-                    maze.remove_wall((i, j), (i + 1, j))
+                    sud[i * w + j] = 0
 
         return maze
 
     @classmethod
-    def gen_sidewinder(cls, h, w):
+    @_instrumented("gen_sidewinder")
+    def gen_sidewinder(cls, h, w, seed=None, vectorized=None):
         """
         Cette méthode génère un labyrinthe selon l'algorithme de sidewinder
+        Pour chaque ligne, on tire d'abord les pile ou face (un bit par cellule), puis un entier
+        de 32 bits par séquence pour choisir la cellule dont on casse le mur sud,
+        ce qui permet à la version NumPy de produire exactement le même labyrinthe
         :param h: la hauteur du labyrinthe
         :param w: la largeur du labyrinthe
+        :param seed: graine (entier) ou instance de random.Random ; None utilise le module random
+        :param vectorized: True pour utiliser NumPy, False pour la version Python,
+                           None pour utiliser NumPy s'il est installé
         :return: le nouveau labyrinthe
         """
+        rng = _rng(seed)
         maze = cls(h, w)
-
-        for i in range(h - 1):
-            sequence = []
-
-            for j in range(w - 1):
-                sequence.append((i, j))
-
-                if random.random() < 0.5:  # si c'est pile
-                    maze.remove_wall((i, j), (i, j + 1))
-                else:
-                    if sequence:  # si la séquence n'est pas vide
-                        random_cell = random.choice(sequence)
-                        maze.remove_wall(random_cell, (random_cell[0] + 1, random_cell[1]))
-                    sequence = []
-
-                    # ajouter la dernière cellule à la séquence
-            sequence.append((i, w - 1))
-
-            #Casser le mur SUD d'une cellule aléatoire dans la séquence
-            if sequence:
-                random_cell = random.choice(sequence)
-                maze.remove_wall(random_cell, (random_cell[0] + 1, random_cell[1]))
-
-        #Casser tous les murs EST de la dernière ligne
-        for j in range(w - 1):
-            maze.remove_wall((h - 1, j), (h - 1, j + 1))
+        maze.generator = "sidewinder"
+        maze.seed = seed if isinstance(seed, int) else None
+        if _use_numpy(vectorized):
+            _sidewinder_numpy(maze, rng)
+            return maze
+        for i, (est, sud) in enumerate(_sidewinder_rows(rng, w, h)):
+            maze._east[i * w:(i + 1) * w] = est
+            maze._south[i * w:(i + 1) * w] = sud
         return maze
 
     @classmethod
-    def gen_fusion(cls, h, w):
+    @_instrumented("gen_fusion")
+    def gen_fusion(cls, h, w, seed=None, _scratch=None):
         """
         Méthode de classe pour générer un labyrinthe à h lignes et w colonnes
         en utilisant l'algorithme de fusion.
         :param h: la hauteur du labyrinthe
         :param w: la largeur du labyrinthe
+        :param seed: graine (entier) ou instance de random.Random ; None utilise le module random
         return: retourne le labyrinthe parfait
         """
+        rng = _rng(seed)
         maze = cls(h, w)
+        maze.generator = "fusion"
+        maze.seed = seed if isinstance(seed, int) else None
         maze.fill()
-        labels = []
-
-        # Labélisation des cellules de 1 à n
-        for i in range(h):
-            for j in range(w):
-                labels.append(i * w + j + 1)
-
-        # Extraction de la liste des murs
-        walls = maze.get_walls()
+        # Chaque cellule forme au départ son propre ensemble
+        ensembles = _scratch_buffer(_scratch, "ensembles", lambda: UnionFind(h * w))
+
+        # Extraction des murs intérieurs sous forme d'entiers :
+        # 2k pour le mur est de la cellule k, 2k + 1 pour son mur sud
+        with _phase("gen_fusion", "extraction"):
+            walls = [2 * k for k in range(h * w) if k % w != w - 1]
+            walls.extend(range(1, 2 * (h - 1) * w, 2))
         # On permute les murs
-        random.shuffle(walls)
+        with _phase("gen_fusion", "shuffle"):
+            rng.shuffle(walls)
         # Pour chaque mur de la liste
-        for wall in walls:
-            label_c1 = labels[wall[0][0] * w + wall[0][1]]
-            label_c2 = labels[wall[1][0] * w + wall[1][1]]
-
-            if label_c1 != label_c2:  # Si les deux cellules n'ont pas le même label
-                maze.remove_wall(wall[0], wall[1])  # Casser le mur
+        with _phase("gen_fusion", "merge"):
+            for wall in walls:
+                k = wall >> 1
+                if wall & 1:
+                    voisine = k + w
+                    murs = maze._south
+                else:
+                    voisine = k + 1
+                    murs = maze._east
 
-                # Affecter le label de l'une des deux cellules à l'autre et à toutes celles qui ont le même label que la deuxième
-                for i in range(h * w):
-                    if labels[i] == label_c2:
-                        labels[i] = label_c1
+                if ensembles.union(k, voisine):  # Si les deux cellules n'étaient pas dans le même ensemble
+                    murs[k] = 0  # Casser le mur
         return maze
 
     @classmethod
-    def gen_exploration(cls, h, w):
+    @_instrumented("gen_exploration")
+    def gen_exploration(cls, h, w, seed=None, _scratch=None):
         """
         Cette méthode génère un labyrinthe selon l'algorithme de d'exploration exhaustive
         :param h: la hauteur du labyrinthe
         :param w: la largeur du labyrinthe
+        :param seed: graine (entier) ou instance de random.Random ; None utilise le module random
         :return: le nouveau labyrinthe
         """
+        rng = _rng(seed)
         maze = cls(h, w)
-        cells = maze.get_cells()
+        maze.generator = "exploration"
+        maze.seed = seed if isinstance(seed, int) else None
+        est, sud = maze._east, maze._south
+        # Tableau des cellules visitées, indexé par numéro de cellule
+        visite = _scratch_buffer(_scratch, "visite", lambda: bytearray(h * w))
+        bords = _grid_mask(h, w)
+        # Tampon réutilisé pour les voisines non visitées (au plus 4)
+        candidats = [0, 0, 0, 0]
         # Choisir une cellule aléatoire
-        randomCell = random.choice(cells)
-        # Liste des cellules visitées
-        marked = [randomCell]
+        cellule = rng.randrange(h * w)
+        visite[cellule] = 1
         # Créer la pile et ajouter la cellule aléatoirement choisie
-        pile = [randomCell]
-
-        while len(pile) > 0:
-            # Prendre la cellule au dessus de la pile et la retirer
-            higherCell = pile[len(pile) - 1]
-            pile.pop(len(pile) - 1)
-            # Vérifier les voisins non marqués de la cellule
-            neighbors = maze.get_contiguous_cells(higherCell)
-
-            nonMarkedNeighbors = []
-            for neighbor in neighbors:
-                if neighbor not in marked:
-                    nonMarkedNeighbors.append(neighbor)
-
-            # Si cette cellule a des voisins qui n'ont pas encore été visités
-            if len(nonMarkedNeighbors) > 0:
-                # Remettre la cellule sur la pile
-                pile.append(higherCell)
-                # Choisir au hasard l'une de ses cellules contiguës qui n’a pas été visitée
-                randomContigue = random.choice(nonMarkedNeighbors)
-                # Casser le mur entre la cellule (celle qui a été dépilée) et celle qui vient d’être choisie
-                maze.remove_wall(higherCell, randomContigue)
-                # Marquer la cellule qui vient d’être choisie comme visitée
-                marked.append(randomContigue)
-                # Et la mettre sur la pile
-                pile.append(randomContigue)
+        pile = [cellule]
+
+        while pile:
+            # Regarder la cellule au dessus de la pile
+            cellule = pile[-1]
+            # Vérifier les voisines non visitées de la cellule (haut, bas, gauche, droite)
+            nb = 0
+            m = bords[cellule]
+            if m & HAUT and not visite[cellule - w]:
+                candidats[nb] = cellule - w
+                nb += 1
+            if m & BAS and not visite[cellule + w]:
+                candidats[nb] = cellule + w
+                nb += 1
+            if m & GAUCHE and not visite[cellule - 1]:
+                candidats[nb] = cellule - 1
+                nb += 1
+            if m & DROITE and not visite[cellule + 1]:
+                candidats[nb] = cellule + 1
+                nb += 1
+
+            # Si cette cellule n'a plus de voisine à visiter, on la retire de la pile
+            if nb == 0:
+                pile.pop()
+                continue
+            # Choisir au hasard l'une de ses cellules contiguës qui n’a pas été visitée
+            choisie = candidats[rng.randrange(nb)]
+            # Casser le mur entre la cellule et celle qui vient d’être choisie
+            if choisie == cellule - w:
+                sud[choisie] = 0
+            elif choisie == cellule + w:
+                sud[cellule] = 0
+            elif choisie == cellule - 1:
+                est[choisie] = 0
+            else:
+                est[cellule] = 0
+            # Marquer la cellule qui vient d’être choisie comme visitée et la mettre sur la pile
+            visite[choisie] = 1
+            pile.append(choisie)
 
         return maze
 
     @classmethod
-    def gen_wilson(cls, h, w):
+    @_instrumented("gen_wilson")
+    def gen_wilson(cls, h, w, seed=None, _scratch=None):
         """
         Cette méthode génère un labyrinthe parfait en utilisant l'algorithme de Wilson
         :param h: la hauteur du labyrinthe
         :param w: la largeur du labyrinthe
+        :param seed: graine (entier) ou instance de random.Random ; None utilise le module random
         :return: le nouveau labyrinthe
         """
-
+        rng = _rng(seed)
         maze = cls(h, w)
-
-        # Initialiser la liste de toutes les cellules non visitées
-        cellules_non_visitees = []
-        for i in range(h):
-            for j in range(w):
-                cellules_non_visitees.append((i, j))
+        maze.generator = "wilson"
+        maze.seed = seed if isinstance(seed, int) else None
+        est, sud = maze._east, maze._south
+
+        # Ensemble des cellules qui ne sont pas encore dans l'arbre
+        non_visitees = _scratch_buffer(_scratch, "non_visitees", lambda: IndexableSet(h * w))
+        dans_arbre = _scratch_buffer(_scratch, "dans_arbre", lambda: bytearray(h * w))
+        # Direction prise lors du dernier passage de la marche aléatoire dans chaque cellule :
+        # réécrire cette direction à chaque passage efface implicitement les boucles
+        # (pas besoin de remise à zéro : chaque case est écrite avant d'être lue)
+        suivante = _scratch_buffer(_scratch, "suivante", lambda: bytearray(h * w), reset=False)
+        # Voisines de chaque cellule (format CSR partagé) : la direction est mémorisée
+        # comme rang de la voisine choisie dans voisins[debut[k]:debut[k + 1]]
+        debut, voisins = _scratch_buffer(_scratch, "csr", lambda: _grid_adjacency(h, w), reset=False)
 
         # Choisir une cellule au hasard pour commencer
-        cellule_depart = random.choice(cellules_non_visitees)
-        cellules_visitees = [cellule_depart]
-        cellules_non_visitees.remove(cellule_depart)
+        cellule_depart = non_visitees.random_element(rng)
+        dans_arbre[cellule_depart] = 1
+        non_visitees.remove(cellule_depart)
 
         # Tant qu'il reste des cellules non visitées
-        while cellules_non_visitees:
+        while non_visitees:
             # Choisir une cellule non visitée au hasard pour commencer une marche aléatoire
-            cellule_actuelle = random.choice(cellules_non_visitees)
+            depart = non_visitees.random_element(rng)
+
+            # Effectuer une marche aléatoire jusqu'à atteindre une cellule de l'arbre
+            cellule = depart
+            while not dans_arbre[cellule]:
+                p = debut[cellule]
+                d = rng.randrange(debut[cellule + 1] - p)
+                suivante[cellule] = d
+                cellule = voisins[p + d]
+
+            # Suivre le chemin sans boucle depuis le départ, l'ajouter à l'arbre et casser les murs
+            cellule = depart
+            while not dans_arbre[cellule]:
+                dans_arbre[cellule] = 1
+                non_visitees.remove(cellule)
+                prochaine = voisins[debut[cellule] + suivante[cellule]]
+                if prochaine == cellule - w:
+                    sud[prochaine] = 0
+                elif prochaine == cellule + w:
+                    sud[cellule] = 0
+                elif prochaine == cellule - 1:
+                    est[prochaine] = 0
+                else:
+                    est[cellule] = 0
+                cellule = prochaine
+        return maze
 
-            # Initialiser le chemin avec la cellule actuelle
-            chemin = [cellule_actuelle]
+    @classmethod
+    @_instrumented("gen_eller")
+    def gen_eller(cls, h, w, seed=None):
+        """
+        Cette méthode génère un labyrinthe selon l'algorithme d'Eller, ligne par ligne
+        (voir stream_rows, qui produit les mêmes lignes sans garder le labyrinthe en mémoire)
+        :param h: la hauteur du labyrinthe
+        :param w: la largeur du labyrinthe
+        :param seed: graine (entier) ou instance de random.Random ; None utilise le module random
+        :return: le nouveau labyrinthe
+        """
+        maze = cls(h, w)
+        maze.generator = "eller"
+        maze.seed = seed if isinstance(seed, int) else None
+        for i, (est, sud) in enumerate(cls.stream_rows(w, h, "eller", seed)):
+            maze._east[i * w:(i + 1) * w] = est
+            maze._south[i * w:(i + 1) * w] = sud
+        return maze
 
-            # Effectuer une marche aléatoire jusqu'à atteindre une cellule visitée
-            while cellule_actuelle not in cellules_visitees:
-                voisins = maze.get_contiguous_cells(cellule_actuelle)
-                voisins_non_visites = []
-                for voisin in voisins:
-                    if voisin not in chemin:
-                        voisins_non_visites.append(voisin)
+    @staticmethod
+    def stream_rows(width, height=None, algorithm="eller", seed=None):
+        """
+        Générateur des lignes de murs d'un labyrinthe parfait, produites une par une
+        en ne gardant que l'état d'une ligne (mémoire en O(width)) :
+          - "eller" : étiquettes des ensembles de la ligne courante
+          - "sidewinder" : séquence en cours (mêmes lignes que gen_sidewinder sans NumPy)
+        :param width: la largeur du labyrinthe
+        :param height: la hauteur du labyrinthe, ou None pour un flux sans fin
+                       (toute ligne produite reste valide ; seule la dernière ligne d'un
+                       flux de hauteur connue referme le labyrinthe)
+        :param algorithm: "eller" ou "sidewinder"
+        :param seed: graine (entier) ou instance de random.Random ; None utilise le module random
+        :return: pour chaque ligne, le couple (murs est, murs sud) sous forme d'octets
+        """
+        flux = {"eller": _eller_rows, "sidewinder": _sidewinder_rows}
+        if algorithm not in flux:
+            raise ValueError(f"Algorithme de flux inconnu : {algorithm!r}")
+        return flux[algorithm](_rng(seed), width, height)
 
-                if not voisins_non_visites:
-                    break
+    @staticmethod
+    def write_text_stream(stream, width, rows, content=None):
+        """
+        Écrit le rendu texte d'un flux de lignes de murs (voir stream_rows) au fur et à mesure
+        :param stream: objet fichier ouvert en mode texte
+        :param width: la largeur du labyrinthe
+        :param rows: itérable de couples (murs est, murs sud)
+        :param content: dictionnaire facultatif du contenu des cellules (voir overlay)
+        :return: rien
+        """
+        write = stream.write
+        for ligne in _render_lines(width, rows, content):
+            write(ligne)
 
-                prochaine_cellule = random.choice(voisins_non_visites)
-                chemin.append(prochaine_cellule)
-                cellule_actuelle = prochaine_cellule
-
-            # Marquer chaque cellule du chemin et casser les murs jusqu'à la cellule marquée
-            for i in range(len(chemin) - 1):
-                cellule = chemin[i]
-                prochaine_cellule = chemin[i + 1]
-                maze.remove_wall(cellule, prochaine_cellule)
-                cellules_visitees.append(cellule)
-                cellules_non_visitees.remove(cellule)
-        return maze
+    @staticmethod
+    def write_binary_stream(path, width, rows, generator=None, seed=None):
+        """
+        Enregistre un flux de lignes de murs au format de save, sans connaître la hauteur à l'avance
+        La hauteur est écrite à 0 dans l'en-tête puis corrigée à la fin si le fichier le permet ;
+        sinon load la déduit de la taille du fichier
+        Les murs sud de la dernière ligne sont toujours écrits fermés : un flux sans fin coupé
+        (par exemple avec itertools.islice) donne un labyrinthe valide, mais pas forcément parfait
+        :param path: chemin du fichier, ou objet fichier ouvert en écriture binaire
+        :param width: la largeur du labyrinthe
+        :param rows: itérable de couples (murs est, murs sud)
+        :param generator: nom du générateur enregistré dans l'en-tête
+        :param seed: graine enregistrée dans l'en-tête
+        :return: le nombre de lignes écrites
+        """
+        with contextlib.ExitStack() as pile:
+            f = pile.enter_context(open(path, "wb")) if isinstance(path, (str, os.PathLike)) else path
+            debut = f.tell() if f.seekable() else None
+            _write_header(f, 0, width, generator, seed)
+            hauteur = 0
+            # Chaque ligne est écrite à l'arrivée de la suivante : les murs sud de la dernière
+            # sont refermés, même si le flux a été coupé (flux sans fin de stream_rows)
+            precedente = None
+            for ligne in rows:
+                if precedente is not None:
+                    f.write(_pack_bits(precedente[0]))
+                    f.write(_pack_bits(precedente[1]))
+                precedente = ligne
+                hauteur += 1
+            if precedente is not None:
+                f.write(_pack_bits(precedente[0]))
+                f.write(_pack_bits(b"\x01" * width))
+            if debut is not None:
+                fin = f.tell()
+                f.seek(debut)
+                _write_header(f, hauteur, width, generator, seed)
+                f.seek(fin)
+        return hauteur
 
     def overlay(self, content=None):
         """
@@ -407,139 +1460,556 @@ class Maze:
         Retour:
             string
         """
-        if content is None:
-            content = {(i, j): ' ' for i in range(self.height) for j in range(self.width)}
-        else:
-            # Python >=3.9
-            # content = content | {(i, j): ' ' for i in range(
-            #    self.height) for j in range(self.width) if (i,j) not in content}
-            # Python <3.9
-            new_content = {(i, j): ' ' for i in range(self.height) for j in range(self.width) if (i, j) not in content}
-            content = {**content, **new_content}
-        txt = r""
-        # Première ligne
-        txt += "┏"
-        for j in range(self.width - 1):
-            txt += "━━━┳"
-        txt += "━━━┓\n"
-        txt += "┃"
-        for j in range(self.width - 1):
-            txt += " " + content[(0, j)] + " ┃" if (0, j + 1) not in self.neighbors[(0, j)] else " " + content[
-                (0, j)] + "  "
-        txt += " " + content[(0, self.width - 1)] + " ┃\n"
-        # Lignes normales
-        for i in range(self.height - 1):
-            txt += "┣"
-            for j in range(self.width - 1):
-                txt += "━━━╋" if (i + 1, j) not in self.neighbors[(i, j)] else "   ╋"
-            txt += "━━━┫\n" if (i + 1, self.width - 1) not in self.neighbors[(i, self.width - 1)] else "   ┫\n"
-            txt += "┃"
-            for j in range(self.width):
-                txt += " " + content[(i + 1, j)] + " ┃" if (i + 1, j + 1) not in self.neighbors[(i + 1, j)] else " " + \
-                                                                                                                 content[
-                                                                                                                     (
-                                                                                                                     i + 1,
-                                                                                                                     j)] + "  "
-            txt += "\n"
-        # Bas du tableau
-        txt += "┗"
-        for i in range(self.width - 1):
-            txt += "━━━┻"
-        txt += "━━━┛\n"
-        return txt
+        return "".join(self.iter_lines(content))
 
-    def solve_dfs(self, start, stop):
+    def _raster_options(self, heatmap):
         """
-        Résout le labyrinthe en utilisant un parcours en profondeur.
-        :param start: La cellule de départ
-        :param stop: La cellule d'arrivée
-        :return: Le chemin de la cellule de départ à la cellule d'arrivée, ou None s'il n'y a pas de chemin
+        :return: les lignes de murs et la carte de chaleur à transmettre au module raster
         """
-        pred = {}
-        pile = [start]  # Pile pour le parcours en profondeur
+        if isinstance(heatmap, tuple):
+            heatmap = self.distance_field(heatmap)
+        return self._rows(), heatmap
 
-        chemin = None
+    def save_ppm(self, path, cell=3, solution=None, heatmap=None):
+        """
+        Enregistre l'image du labyrinthe au format PPM binaire (voir raster.write_ppm)
+        :param path: chemin du fichier, ou objet fichier ouvert en écriture binaire
+        :param cell: côté d'une cellule en pixels
+        :param solution: chemin facultatif à dessiner (liste de cellules, par exemple le résultat de solve)
+        :param heatmap: distances par numéro de cellule (voir distance_field), ou cellule (l, c)
+                        dont le champ de distances est dessiné
+        :return: rien
+        """
+        rows, heatmap = self._raster_options(heatmap)
+        raster.write_ppm(path, self.height, self.width, rows, cell, solution, heatmap)
 
-        # Parcours en profondeur
-        while pile and chemin is None:
-            cellule_courant = pile.pop()
+    def save_png(self, path, cell=3, solution=None, heatmap=None, level=1):
+        """
+        Enregistre l'image du labyrinthe au format PNG (voir raster.write_png)
+        Les autres paramètres sont ceux de save_ppm
+        :param level: niveau de compression zlib (0 à 9)
+        :return: rien
+        """
+        rows, heatmap = self._raster_options(heatmap)
+        raster.write_png(path, self.height, self.width, rows, cell, solution, heatmap, level)
 
-            if cellule_courant == stop:
-                chemin = [stop]
-                while chemin[-1] != start:
-                    chemin.append(pred[chemin[-1]])
+    @classmethod
+    def _from_planes(cls, height, width, east, south):
+        """
+        Construit un labyrinthe à partir de tableaux de murs existants (sans copie)
+        :param east: murs est, indexés par numéro de cellule
+        :param south: murs sud, indexés par numéro de cellule
+        :return: le labyrinthe
+        """
+        maze = cls(0, 0)
+        maze.height = height
+        maze.width = width
+        maze._east, maze._south = _close_border(east, south, height, width)
+        return maze
 
-            # Récupérer les cellules accessibles depuis la cellule courante
-            reachable_cells = self.get_reachable_cells(cellule_courant)
+    def clone(self):
+        """
+        Cette méthode copie le labyrinthe : les deux tableaux de murs sont recopiés
+        d'un bloc, les caches (adjacence, distances, index) ne sont pas partagés
+        et seul le masque d'adjacence, s'il est à jour, est recopié
+        :return: le nouveau labyrinthe, indépendant de celui-ci
+        """
+        maze = type(self)._from_planes(self.height, self.width, _copy_plane(self._east), _copy_plane(self._south))
+        maze.generator = self.generator
+        maze.seed = self.seed
+        if self._adjacence is not None and self._adjacence[0] == self._version:
+            maze._adjacence = (maze._version, bytearray(self._adjacence[1]))
+        return maze
 
-            # Parcourir les cellules accessibles
-            for cell in reachable_cells:
-                if cell not in pred:
-                    pred[cell] = cellule_courant
-                    pile.append(cell)
-        return chemin
+    def __copy__(self):
+        return self.clone()
 
-    def solve_bfs(self, start, stop):
+    def __deepcopy__(self, memo):
+        copie = self.clone()
+        memo[id(self)] = copie
+        return copie
+
+    def snapshot(self):
         """
-        Résout le labyrinthe en utilisant un parcours en largeur.
+        Cette méthode mémorise l'état des murs du labyrinthe (une copie de chaque tableau)
+        :return: l'instantané (MazeSnapshot), à passer à restore
+        """
+        return MazeSnapshot(self.height, self.width, bytes(self._east), bytes(self._south),
+                            self.generator, self.seed)
+
+    def restore(self, snapshot):
+        """
+        Cette méthode rétablit l'état des murs mémorisé par snapshot
+        Les caches sont invalidés et le journal d'annulation est vidé
+        :param snapshot: un instantané produit par snapshot
+        :return: rien
+        """
+        self.height, self.width = snapshot.height, snapshot.width
+        self._east = bytearray(snapshot.east)
+        self._south = bytearray(snapshot.south)
+        self.generator, self.seed = snapshot.generator, snapshot.seed
+        self._bulk_edited()
+
+    def save(self, path):
+        """
+        Enregistre le labyrinthe au format binaire compact :
+        un en-tête (version, hauteur, largeur, graine, générateur) suivi,
+        ligne par ligne, des bits des murs est puis des bits des murs sud
+        (deux bits par cellule)
+        Le fichier est écrit à côté puis renommé : path peut être le fichier dont
+        le labyrinthe a été chargé (voir load)
+        :param path: chemin du fichier
+        :return: rien
+        """
+        temporaire = f"{os.fspath(path)}.{os.getpid()}.tmp"
+        try:
+            with open(temporaire, "wb") as f:
+                _write_header(f, self.height, self.width, self.generator, self.seed)
+                for est, sud in self._rows():
+                    f.write(_pack_bits(est))
+                    f.write(_pack_bits(sud))
+            os.replace(temporaire, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temporaire)
+            raise
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Charge un labyrinthe enregistré avec save
+        :param path: chemin du fichier
+        :param mmap: si True, le fichier est projeté en mémoire et les murs ne sont décodés
+                     (une seule fois, dans des tableaux d'octets) qu'au premier accès :
+                     charger un labyrinthe pour lire ses dimensions ou son générateur
+                     ne lit pas les murs ; sinon les murs sont décodés tout de suite
+        Les murs extérieurs sont toujours refermés, quel que soit le contenu du fichier
+        :return: le labyrinthe
+        """
+        with open(path, "rb") as f:
+            height, width, generator, seed, debut = _read_header(f)
+            if mmap:
+                donnees = MemoryMap(f.fileno(), 0, access=ACCESS_COPY)
+            else:
+                donnees = f.read()
+                debut = 0
+        octets_ligne = (width + 7) // 8
+        if height == 0 and width:
+            # Hauteur inconnue à l'écriture (flux) : on la déduit de la taille du fichier
+            height = (len(donnees) - debut) // (2 * octets_ligne)
+        planes = _MappedPlanes(donnees, debut, height, width)
+        if mmap:
+            # Décodage différé : voir Maze.__getattr__
+            maze = cls(0, 0)
+            maze.height = height
+            maze.width = width
+            del maze._east, maze._south
+            maze._mapped_planes = planes
+        else:
+            maze = cls._from_planes(height, width, *planes.decode())
+        maze.generator = generator
+        maze.seed = seed
+        return maze
+
+    def adjacency(self)->bytearray:
+        """
+        Cette méthode donne le masque des directions ouvertes de chaque cellule
+        (bits HAUT, BAS, GAUCHE, DROITE), indexé par numéro de cellule
+        Le masque est calculé une fois puis partagé par les solveurs
+        tant que le labyrinthe n'est pas modifié
+        :return: le masque sous forme de tableau d'octets
+        """
+        if self._adjacence is not None and self._adjacence[0] == self._version:
+            return self._adjacence[1]
+        n = self.height * self.width
+        w = self.width
+        est, sud = self._east, self._south
+        # Chaque plan de murs est traduit en bits de direction puis les quatre
+        # plans sont combinés par un OU sur des entiers (opérations linéaires en C)
+        bas = sud.translate(_OUVERT_VERS[BAS])
+        droite = est.translate(_OUVERT_VERS[DROITE])
+        haut = bytes(min(w, n)) + sud[:n - w].translate(_OUVERT_VERS[HAUT])
+        gauche = bytes(min(1, n)) + est[:n - 1].translate(_OUVERT_VERS[GAUCHE])
+        masque = 0
+        for plan in (haut, bas, gauche, droite):
+            masque |= int.from_bytes(plan, "little")
+        masque = bytearray(masque.to_bytes(n, "little"))
+        self._adjacence = (self._version, masque)
+        return masque
+
+    @_instrumented("solve")
+    def solve(self, start, stop, method=None):
+        """
+        Résout le labyrinthe entre start et stop
         :param start: La cellule de départ
         :param stop: La cellule d'arrivée
-        :return: Le chemin de la cellule de départ à la cellule d'arrivée, ou                  None s'il n'y a pas de chemin
+        :param method: "dfs" (profondeur), "bfs" (largeur avec arrêt dès que stop est atteint),
+                       "bidirectional" (largeur depuis les deux extrémités)
+                       "astar" (A* guidé par distance_man),
+                       "field" (chemin lu dans le champ de distances en cache)
+                       "tree" (remontée dans l'index d'arbre, voir build_tree_index),
+                       "rhr" (règle de la main droite, en O(nombre de pas))
+                       ou "fill" (comblement des impasses, seul le couloir de la solution reste) ;
+                       None choisit "tree" si un index d'arbre à jour existe, "bfs" sinon
+        :return: Le chemin de start à stop (liste de cellules), ou None s'il n'y a pas de chemin
+        Le nombre de cellules développées est disponible ensuite dans self.solve_stats
         """
-        pred = {}
-        file = [start]  # File pour le parcours en largeur
+        solveurs = {
+            "dfs": self._solve_dfs,
+            "bfs": self._solve_bfs,
+            "bidirectional": self._solve_bidirectional,
+            "astar": self._solve_astar,
+            "field": self._solve_field,
+            "tree": self._solve_tree,
+            "rhr": self._solve_rhr,
+            "fill": self._solve_fill,
+        }
+        if method is None:
+            method = "tree" if self._fresh_tree_index() is not None else "bfs"
+        if method not in solveurs:
+            raise ValueError(f"Méthode de résolution inconnue : {method}")
+        w = self.width
+        source = start[0] * w + start[1]
+        cible = stop[0] * w + stop[1]
+        if source == cible:
+            chemin, developpees = [source], 0
+        else:
+            if method != "tree":
+                with _phase("solve", "adjacency"):
+                    self.adjacency()
+            with _phase("solve", method):
+                chemin, developpees = solveurs[method](source, cible)
+        self.solve_stats = {"method": method, "expanded": developpees}
+        if _profiler is not None:
+            _profiler._ajouter(_profiler.expanded, method, developpees)
+        if chemin is None:
+            return None
+        return [divmod(k, w) for k in chemin]
 
-        chemin = None
+    def build_tree_index(self, root=(0, 0)):
+        """
+        Construit l'index d'arbre d'un labyrinthe parfait : enraciné en root, il donne
+        la profondeur de chaque cellule et ses ancêtres de rang 2^j (remontée binaire),
+        ce qui permet de calculer un plus proche ancêtre commun en O(log n)
+        L'index est utilisé par distance_geo et solve tant que le labyrinthe n'est pas modifié
+        :param root: la racine de l'arbre
+        :return: l'index (TreeIndex)
+        """
+        h, w = self.height, self.width
+        n = h * w
+        # Même critère que is_perfect, la connexité étant lue dans le parcours qui construit l'arbre
+        if 2 * n - self._east.count(1) - self._south.count(1) != n - 1:
+            raise ValueError("L'index d'arbre n'est défini que pour un labyrinthe parfait")
+        dist, pred = self._bfs_field(root[0] * w + root[1])
+        if -1 in dist:
+            raise ValueError("L'index d'arbre n'est défini que pour un labyrinthe parfait")
+        self._tree_index = TreeIndex(w, dist, pred, self._version)
+        return self._tree_index
+
+    def _fresh_tree_index(self):
+        """
+        :return: l'index d'arbre s'il a été construit depuis la dernière modification, None sinon
+        """
+        index = self._tree_index
+        if index is not None and index.version == self._version:
+            return index
+        return None
+
+    def _solve_tree(self, source, cible):
+        index = self._fresh_tree_index() or self.build_tree_index()
+        chemin = index.path(source, cible)
+        return chemin, len(chemin)
+
+    def _voisines(self):
+        """
+        :return: les couples (bit de direction, décalage d'indice) des quatre directions
+        """
+        w = self.width
+        return ((HAUT, -w), (BAS, w), (GAUCHE, -1), (DROITE, 1))
+
+    @staticmethod
+    def _remonter(pred, source, cible):
+        """
+        Reconstruit le chemin de source à cible à partir du tableau des prédécesseurs
+        """
+        chemin = [cible]
+        while chemin[-1] != source:
+            chemin.append(pred[chemin[-1]])
+        chemin.reverse()
+        return chemin
 
-        # Parcours en largeur
+    def _solve_dfs(self, source, cible):
+        masque = self.adjacency()
+        directions = self._voisines()
+        pred = array("i", [-1]) * len(masque)
+        pred[source] = source
+        pile = [source]
+        developpees = 0
+        while pile:
+            k = pile.pop()
+            developpees += 1
+            if k == cible:
+                return self._remonter(pred, source, cible), developpees
+            m = masque[k]
+            for bit, decalage in directions:
+                if m & bit and pred[k + decalage] < 0:
+                    pred[k + decalage] = k
+                    pile.append(k + decalage)
+        return None, developpees
+
+    def _solve_bfs(self, source, cible):
+        masque = self.adjacency()
+        directions = self._voisines()
+        pred = array("i", [-1]) * len(masque)
+        pred[source] = source
+        file = deque([source])
+        developpees = 0
         while file:
-            cellule_courant = file.pop(0)
+            k = file.popleft()
+            developpees += 1
+            m = masque[k]
+            for bit, decalage in directions:
+                if m & bit and pred[k + decalage] < 0:
+                    pred[k + decalage] = k
+                    if k + decalage == cible:
+                        return self._remonter(pred, source, cible), developpees
+                    file.append(k + decalage)
+        return None, developpees
+
+    def _solve_bidirectional(self, source, cible):
+        masque = self.adjacency()
+        directions = self._voisines()
+        n = len(masque)
+        # Un tableau de prédécesseurs pour chaque sens de parcours
+        preds = (array("i", [-1]) * n, array("i", [-1]) * n)
+        preds[0][source] = source
+        preds[1][cible] = cible
+        fronts = ([source], [cible])
+        developpees = 0
+        while fronts[0] and fronts[1]:
+            # On développe toujours le front le plus petit, niveau par niveau
+            cote = 0 if len(fronts[0]) <= len(fronts[1]) else 1
+            pred, autre = preds[cote], preds[1 - cote]
+            suivant = []
+            for k in fronts[cote]:
+                developpees += 1
+                m = masque[k]
+                for bit, decalage in directions:
+                    v = k + decalage
+                    if m & bit and pred[v] < 0:
+                        pred[v] = k
+                        if autre[v] >= 0:
+                            # Les deux parcours se rejoignent en v
+                            debut = self._remonter(preds[0], source, v)
+                            fin = self._remonter(preds[1], cible, v)
+                            fin.reverse()
+                            return debut + fin[1:], developpees
+                        suivant.append(v)
+            fronts = (suivant, fronts[1]) if cote == 0 else (fronts[0], suivant)
+        return None, developpees
+
+    def _solve_astar(self, source, cible):
+        masque = self.adjacency()
+        directions = self._voisines()
+        w = self.width
+        stop = divmod(cible, w)
+        cout = array("i", [-1]) * len(masque)
+        pred = array("i", [-1]) * len(masque)
+        cout[source] = 0
+        pred[source] = source
+        tas = [(self.distance_man(divmod(source, w), stop), 0, source)]
+        developpees = 0
+        while tas:
+            _, g, k = heapq.heappop(tas)
+            if g > cout[k]:
+                continue  # entrée périmée
+            developpees += 1
+            if k == cible:
+                return self._remonter(pred, source, cible), developpees
+            m = masque[k]
+            for bit, decalage in directions:
+                v = k + decalage
+                if m & bit and (cout[v] < 0 or g + 1 < cout[v]):
+                    cout[v] = g + 1
+                    pred[v] = k
+                    heapq.heappush(tas, (g + 1 + self.distance_man(divmod(v, w), stop), g + 1, v))
+        return None, developpees
+
+    def _solve_rhr(self, source, cible):
+        # Le suiveur garde un cap ; le chemin est effacé de ses boucles au fil de l'eau
+        # grâce à la position de chaque cellule dans le chemin (-1 si elle n'y est pas)
+        masque = self.adjacency()
+        n = len(masque)
+        w = self.width
+        decalages = (-w, 1, w, -1)  # dans l'ordre des caps : haut, droite, bas, gauche
+        position = array("i", [-1]) * n
+        position[source] = 0
+        chemin = [source]
+        k, cap = source, 2
+        for pas in range(4 * n):
+            cap = _MAIN_DROITE[masque[k] << 2 | cap]
+            if cap == 4:
+                return None, pas  # cellule sans ouverture
+            k += decalages[cap]
+            p = position[k]
+            if p >= 0:
+                # Retour sur une cellule du chemin : la boucle est effacée
+                for c in chemin[p + 1:]:
+                    position[c] = -1
+                del chemin[p + 1:]
+            else:
+                position[k] = len(chemin)
+                chemin.append(k)
+            if k == cible:
+                return chemin, pas + 1
+        return None, 4 * n
 
-            if cellule_courant == stop:
-                chemin = [stop]
-                while chemin[-1] != start:
-                    chemin.append(pred[chemin[-1]])
+    def _dead_end_fill(self, source, cible):
+        """
+        Comble les impasses du labyrinthe, sauf source et cible : une cellule qui n'a plus
+        qu'une voisine non comblée est comblée à son tour (liste de travail), si bien qu'il
+        ne reste que les cellules des chemins entre source et cible (et les boucles)
+        (voir batch.dead_end_fill pour la version vectorisée sur un lot de labyrinthes)
+        :return: un octet par cellule, 1 si la cellule est comblée
+        """
+        masque = self.adjacency()
+        degres = bytearray(masque.translate(_DEGRE))
+        comblee = bytearray(len(masque))
+        directions = self._voisines()
+        pile = self._dead_ends()
+        while pile:
+            k = pile.pop()
+            if k == source or k == cible or comblee[k]:
+                continue
+            comblee[k] = 1
+            m = masque[k]
+            for bit, decalage in directions:
+                v = k + decalage
+                if m & bit and not comblee[v]:
+                    degres[v] -= 1
+                    if degres[v] == 1:
+                        pile.append(v)
+        return comblee
+
+    def _solve_fill(self, source, cible):
+        comblee = self._dead_end_fill(source, cible)
+        developpees = comblee.count(1)
+        masque = self.adjacency()
+        directions = self._voisines()
+        # Dans un labyrinthe parfait, il ne reste qu'un couloir : on le parcourt
+        chemin = [source]
+        precedente, k = -1, source
+        while k != cible and len(chemin) <= len(masque):
+            m = masque[k]
+            suivantes = [k + decalage for bit, decalage in directions
+                         if m & bit and not comblee[k + decalage] and k + decalage != precedente]
+            if len(suivantes) != 1:
+                break
+            precedente, k = k, suivantes[0]
+            chemin.append(k)
+        if k == cible:
+            return chemin, developpees + len(chemin)
+        if k == source and not any(masque[source] & bit and not comblee[source + decalage]
+                                   for bit, decalage in directions):
+            return None, developpees  # la cible n'est pas accessible
+        # Il reste des boucles (ou une bifurcation) : parcours en largeur classique
+        chemin, nb = self._solve_bfs(source, cible)
+        return chemin, developpees + nb
+
+    def _bfs_field(self, source):
+        """
+        Parcours en largeur complet depuis la cellule numéro source
+        :return: le couple (distances, prédécesseurs) ; -1 pour les cellules inaccessibles
+        """
+        masque = self.adjacency()
+        directions = self._voisines()
+        dist = array("i", [-1]) * len(masque)
+        pred = array("i", [-1]) * len(masque)
+        dist[source] = 0
+        pred[source] = source
+        file = deque([source])
+        while file:
+            k = file.popleft()
+            d = dist[k] + 1
+            m = masque[k]
+            for bit, decalage in directions:
+                if m & bit and dist[k + decalage] < 0:
+                    dist[k + decalage] = d
+                    pred[k + decalage] = k
+                    file.append(k + decalage)
+        return dist, pred
+
+    def _field_between(self, source, cible):
+        """
+        Cette méthode cherche un champ de distances utilisable pour la paire (source, cible),
+        en priorité un champ déjà en cache pour l'une des deux extrémités
+        :return: le triplet (distances, prédécesseurs, True si le champ est celui de cible)
+        """
+        champ = self.distances.peek(self, source)
+        if champ is not None:
+            return champ[0], champ[1], False
+        champ = self.distances.peek(self, cible)
+        if champ is not None:
+            return champ[0], champ[1], True
+        champ = self.distances.get(self, source)
+        return champ[0], champ[1], False
+
+    def _solve_field(self, source, cible):
+        manques = self.distances.misses
+        dist, pred, inverse = self._field_between(source, cible)
+        developpees = len(dist) if self.distances.misses != manques else 0
+        if inverse:
+            source, cible = cible, source
+        if dist[cible] < 0:
+            return None, developpees
+        chemin = self._remonter(pred, source, cible)
+        if inverse:
+            chemin.reverse()
+        return chemin, developpees
+
+    def distance_field(self, c):
+        """
+        Cette méthode donne les distances géodésiques de c à toutes les cellules
+        Le résultat est mis en cache jusqu'à la prochaine modification du labyrinthe
+        :param c: la cellule source
+        :return: tableau des distances indexé par numéro de cellule (-1 si inaccessible)
+        """
+        return self.distances.get(self, c[0] * self.width + c[1])[0]
 
-            # Récupérer les cellules accessibles depuis la cellule courante
-            reachable_cells = self.get_reachable_cells(cellule_courant)
+    def solve_dfs(self, start, stop):
+        """
+        Résout le labyrinthe en utilisant un parcours en profondeur.
+        :param start: La cellule de départ
+        :param stop: La cellule d'arrivée
+        :return: Le chemin de la cellule d'arrivée à la cellule de départ, ou None s'il n'y a pas de chemin
+        """
+        chemin = self.solve(start, stop, "dfs")
+        return chemin[::-1] if chemin is not None else None
 
-            # Parcourir les cellules accessibles
-            for cell in reachable_cells:
-                if cell not in pred:
-                    pred[cell] = cellule_courant
-                    file.append(cell)
-        return chemin
+    def solve_bfs(self, start, stop):
+        """
+        Résout le labyrinthe en utilisant un parcours en largeur.
+        :param start: La cellule de départ
+        :param stop: La cellule d'arrivée
+        :return: Le chemin de la cellule d'arrivée à la cellule de départ, ou None s'il n'y a pas de chemin
+        """
+        chemin = self.solve(start, stop, "bfs")
+        return chemin[::-1] if chemin is not None else None
 
     def solve_rhr(self, start, stop):
-        pred = {}
-        cellule_courante = start
-        chemin = [start]
-
-        # Liste des directions dans l'ordre: droite, bas, gauche, haut
-        directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-        while cellule_courante != stop:
-            direction_essai = False
-
-            # Essaie de chaque direction
-            for direction in directions:
-                proc_ligne = cellule_courante[0] + direction[0]
-                proc_col = cellule_courante[1] + direction[1]
-                cell_suiv = (proc_ligne, proc_col)
-
-                # Vérifie si la prochaine cellule est valide et n'a pas été visitée
-                if cell_suiv not in pred and cell_suiv in self.neighbors[cellule_courante]:
-                    pred[cell_suiv] = cellule_courante
-                    cellule_courante = cell_suiv
-                    chemin.append(cell_suiv)
-                    direction_essai = True
-
-            # Si aucune direction n'est possible, revenez en arrière
-            if not direction_essai:
-                if len(chemin) == 1:
-                    chemin = None
-                else:
-                    chemin.pop()
-                    cellule_courante = chemin[-1]
+        """
+        Résout le labyrinthe en suivant le mur de droite (voir solve, méthode "rhr")
+        Le suiveur abandonne après 4 * h * w pas si start et stop ne longent pas le même mur
+        (labyrinthe avec des boucles) : le chemin est alors cherché par un parcours en largeur,
+        si bien que None signifie toujours que stop est inaccessible
+        (solve(start, stop, "rhr") donne le résultat du seul suiveur de mur)
+        :param start: La cellule de départ
+        :param stop: La cellule d'arrivée
+        :return: Le chemin de start à stop, sans boucle, ou None s'il n'y a pas de chemin
+        """
+        chemin = self.solve(start, stop, "rhr")
+        if chemin is None:
+            chemin = self.solve(start, stop, "bfs")
         return chemin
 
     def distance_geo(self, c1, c2):
@@ -549,11 +2019,16 @@ class Maze:
         :param c2: La deuxième cellule
         :return: La distance géodésique entre c1 et c2, ou None si aucun chemin n'est trouvé
         """
-        chemin = self.solve_bfs(c1, c2)
-        if chemin is None:
+        w = self.width
+        index = self._fresh_tree_index()
+        if index is not None:
+            return index.distance(c1[0] * w + c1[1], c2[0] * w + c2[1])
+        dist, _, inverse = self._field_between(c1[0] * w + c1[1], c2[0] * w + c2[1])
+        distance = dist[c1[0] * w + c1[1]] if inverse else dist[c2[0] * w + c2[1]]
+        if distance < 0:
             raise ValueError("Aucun chemin trouvé entre les cellules.")
 
-        return len(chemin) - 1
+        return distance
 
     def distance_man(self, c1, c2):
         """
@@ -573,64 +2048,1005 @@ class Maze:
         manhattan_distance = dx + dy
         return manhattan_distance
 
+    def _dead_ends(self)->list:
+        """
+        :return: les numéros des cellules qui n'ont qu'une seule voisine accessible
+        """
+        degres = self.adjacency().translate(_DEGRE)
+        impasses = []
+        k = degres.find(1)
+        while k >= 0:
+            impasses.append(k)
+            k = degres.find(1, k + 1)
+        return impasses
+
     def worst_path_len(self)->int:
         """
         Cette méthode nous donne la  longueur du plus long chemin du départ à une impasse
+        (nombre de cellules du plus court chemin depuis (0, 0), impasses inaccessibles ignorées)
+        Un seul parcours en largeur depuis le départ suffit
         :return: longueur du plus long chemin du départ à une impasse
         """
-        cells = self.get_cells()
-        impasses = []
-        for cell in cells:
-            if len(Maze.get_reachable_cells(self, cell)) == 1:
-                impasses.append(cell)
-        max = 0
-        for impasse in impasses:
-            if max < len(self.solve_rhr((0, 0), impasse)):
-                max = len(self.solve_rhr((0, 0), impasse))
-
-        return max
+        dist = self.distance_field((0, 0))
+        return max((dist[k] + 1 for k in self._dead_ends() if dist[k] >= 0), default=0)
 
     def dead_end_number(self)->int:
         """
         Cette méthode nous donne le nombre de culs-de-sacs
         :return: le nombre de culs-de-sacs
         """
-        cells = self.get_cells()
-        nbCuldeSacs = 0
-        for cell in cells:
-            if len(Maze.get_reachable_cells(self, cell)) == 1:
-                nbCuldeSacs += 1
-        return nbCuldeSacs
+        return self.adjacency().translate(_DEGRE).count(1)
+
+    def metrics(self, start=(0, 0), exact_diameter=False):
+        """
+        Cette méthode calcule les indicateurs du labyrinthe en un seul passage
+        (deux parcours en largeur)
+        Pour un labyrinthe non parfait, le diamètre par double parcours n'est qu'une borne
+        inférieure (diameter_exact vaut False) ; le diamètre exact demande un parcours
+        depuis chaque cellule, soit O((h*w)²)
+        :param start: la cellule de départ
+        :param exact_diameter: True pour calculer le diamètre exact d'un labyrinthe non parfait
+        :return: un objet MazeMetrics
+        """
+        w = self.width
+        source = start[0] * w + start[1]
+        dist, pred = self.distances.get(self, source)
+        impasses = [k for k in self._dead_ends() if dist[k] >= 0]
+        parfait = self.is_perfect()
+
+        # Histogramme des longueurs des chemins du départ aux impasses
+        histogramme = {}
+        for k in impasses:
+            histogramme[dist[k] + 1] = histogramme.get(dist[k] + 1, 0) + 1
+
+        # Facteur de branchement : nombre moyen d'enfants des cellules internes
+        # de l'arbre de parcours depuis le départ
+        enfants = bytearray(len(dist))
+        for k in range(len(dist)):
+            if dist[k] > 0:
+                enfants[pred[k]] += 1
+        internes = len(enfants) - enfants.count(0)
+        branchement = (sum(enfants) / internes) if internes else 0.0
+
+        exact = parfait or exact_diameter
+        if parfait or not exact_diameter:
+            # Dans un arbre, la cellule la plus éloignée d'une cellule quelconque
+            # est une extrémité d'un plus long chemin (ailleurs, c'est une borne inférieure)
+            extremite = dist.index(max(dist))
+            diametre = max(self._bfs_field(extremite)[0])
+        else:
+            diametre = max(max(self._bfs_field(k)[0]) for k in range(len(dist)))
+
+        return MazeMetrics(
+            dead_end_number=self.dead_end_number(),
+            worst_path_len=max(histogramme, default=0),
+            diameter=diametre,
+            branching_factor=branchement,
+            histogram=dict(sorted(histogramme.items())),
+            perfect=parfait,
+            diameter_exact=exact,
+        )
+
+    def is_perfect(self)->bool:
+        """
+        Cette méthode indique si le labyrinthe est parfait, c'est-à-dire
+        s'il possède exactement h*w - 1 passages et si toutes ses cellules sont reliées
+        :return: True si le labyrinthe est parfait, False sinon
+        """
+        h, w = self.height, self.width
+        n = h * w
+        est, sud = self._east, self._south
+        if 2 * n - est.count(1) - sud.count(1) != n - 1:
+            return False
+        # Parcours depuis la cellule 0 pour vérifier la connexité
+        visite = bytearray(n)
+        visite[0] = 1
+        pile = [0]
+        nb_visitees = 1
+        while pile:
+            k = pile.pop()
+            for voisine, ouvert in ((k - w, k >= w and not sud[k - w]), (k + w, not sud[k]),
+                                    (k - 1, k % w and not est[k - 1]), (k + 1, not est[k])):
+                if ouvert and not visite[voisine]:
+                    visite[voisine] = 1
+                    nb_visitees += 1
+                    pile.append(voisine)
+        return nb_visitees == n
+
+    def track_connectivity(self):
+        """
+        Attache au labyrinthe un index de connexité incrémental : les appels suivants
+        à add_wall / remove_wall le tiennent à jour et isPossible l'utilise
+        :return: l'index (ConnectivityIndex)
+        """
+        if self._connectivity is None:
+            self._connectivity = ConnectivityIndex(self)
+        return self._connectivity
+
+    def track_undo(self):
+        """
+        Commence à tenir le journal des modifications faites par add_wall / remove_wall,
+        qui permet de les annuler avec undo (fill, empty et restore vident le journal)
+        :return: rien
+        """
+        if self._journal is None:
+            self._journal = []
 
+    def undo(self, steps=1):
+        """
+        Annule les dernières modifications de murs enregistrées dans le journal (voir track_undo)
+        :param steps: nombre de modifications à annuler
+        :return: le nombre de modifications effectivement annulées
+        """
+        journal = self._journal
+        if journal is None:
+            raise ValueError("Le journal des modifications n'est pas tenu (voir track_undo)")
+        annulees = 0
+        w = self.width
+        while annulees < steps and journal:
+            a, b, ajout = journal.pop()
+            # L'opération inverse ne doit pas être journalisée
+            self._journal = None
+            try:
+                (self.remove_wall if ajout else self.add_wall)(divmod(a, w), divmod(b, w))
+            finally:
+                self._journal = journal
+            annulees += 1
+        return annulees
 
     def isPossible(self, c1, c2):
         """
         Est ce que le labyrinthe est réalisable
         """
-        chemin = self.solve_bfs(c1, c2)
+        w = self.width
+        if self._fresh_tree_index() is not None:
+            return True  # un labyrinthe parfait est connexe
+        if self._connectivity is not None:
+            return self._connectivity.connected(c1[0] * w + c1[1], c2[0] * w + c2[1])
+        dist, _, inverse = self._field_between(c1[0] * w + c1[1], c2[0] * w + c2[1])
+
+        return (dist[c1[0] * w + c1[1]] if inverse else dist[c2[0] * w + c2[1]]) >= 0
+
+    @classmethod
+    def generate_many(cls, algorithm, h, w, n, seed=None, workers=1, **params):
+        """
+        Générateur de n labyrinthes produits par le même algorithme
+        La graine de chaque labyrinthe est tirée d'une graine maître, si bien que
+        la suite obtenue ne dépend pas du nombre de processus utilisés
+        :param algorithm: nom du générateur ("wilson" ou "gen_wilson", "fusion", ...)
+        :param h: la hauteur des labyrinthes
+        :param w: la largeur des labyrinthes
+        :param n: le nombre de labyrinthes
+        :param seed: graine maître (entier ou random.Random) ; None utilise le module random
+        :param workers: nombre de processus (1 : génération dans le processus courant, None : tous les cœurs)
+        :param params: paramètres supplémentaires transmis au générateur
+        :return: un itérateur sur les labyrinthes, produits à la demande
+        """
+        nom = algorithm if algorithm.startswith("gen_") else "gen_" + algorithm
+        if not hasattr(cls, nom):
+            raise ValueError(f"Générateur inconnu : {algorithm}")
+        rng = _rng(seed)
+        graines = (rng.getrandbits(64) for _ in range(n))
+
+        if workers == 1:
+            tampons = {}
+            for graine in graines:
+                yield _generate(cls, nom, h, w, graine, params, tampons)
+            return
+
+        nb_processus = workers or os.cpu_count() or 1
+        taille = max(1, min(16, n // (4 * nb_processus)))
+        with ProcessPoolExecutor(max_workers=nb_processus) as executor:
+            # Au plus quelques lots en cours par processus : la mémoire reste bornée
+            en_cours = deque()
+            lot = []
+            for graine in graines:
+                lot.append(graine)
+                if len(lot) == taille:
+                    en_cours.append(executor.submit(_generate_packed, cls, nom, h, w, lot, params))
+                    lot = []
+                while len(en_cours) >= 2 * nb_processus:
+                    yield from _unpack_batch(cls, nom, h, w, en_cours.popleft().result())
+            if lot:
+                en_cours.append(executor.submit(_generate_packed, cls, nom, h, w, lot, params))
+            while en_cours:
+                yield from _unpack_batch(cls, nom, h, w, en_cours.popleft().result())
+
+    @classmethod
+    @_instrumented("gen_tiled")
+    def gen_tiled(cls, h, w, algorithm="exploration", tile=1024, seed=None, workers=None, **params):
+        """
+        Cette méthode génère un grand labyrinthe parfait par tuiles :
+        la grille est découpée en blocs, chaque bloc est un labyrinthe parfait généré
+        dans un processus de calcul qui écrit ses murs directement dans une mémoire partagée,
+        puis les tuiles sont reliées en cassant exactement un mur de frontière par arête
+        d'un arbre couvrant des tuiles (choisi avec un UnionFind sur les tuiles)
+        Le résultat ne dépend que de la graine, pas du nombre de processus
+        :param h: la hauteur du labyrinthe
+        :param w: la largeur du labyrinthe
+        :param algorithm: générateur utilisé pour chaque tuile ("exploration", "wilson", "fusion", ...)
+        :param tile: côté des tuiles, ou couple (hauteur, largeur)
+        :param seed: graine maître (entier ou random.Random) ; None utilise le module random
+        :param workers: nombre de processus (1 : génération dans le processus courant, None : tous les cœurs)
+        :param params: paramètres supplémentaires transmis au générateur
+        :return: le nouveau labyrinthe
+        """
+        nom = algorithm if algorithm.startswith("gen_") else "gen_" + algorithm
+        if not hasattr(cls, nom):
+            raise ValueError(f"Générateur inconnu : {algorithm}")
+        th, tw = (tile, tile) if isinstance(tile, int) else tile
+        if th < 1 or tw < 1:
+            raise ValueError("Les tuiles doivent avoir au moins une cellule de côté")
+        rng = _rng(seed)
+        # Tuiles dans l'ordre des lignes : (première ligne, première colonne, hauteur, largeur, graine)
+        tuiles = [(i, j, min(th, h - i), min(tw, w - j), rng.getrandbits(64))
+                  for i in range(0, h, th) for j in range(0, w, tw)]
 
-        return chemin != None
+        maze = cls(h, w)
+        maze.generator = "tiled-" + nom[len("gen_"):]
+        maze.seed = seed if isinstance(seed, int) else None
+        with _phase("gen_tiled", "tiles"):
+            if workers == 1 or len(tuiles) <= 1:
+                tampons = {}
+                for tuile in tuiles:
+                    _write_tile(maze._east, maze._south, cls, nom, w, tuile, params, tampons)
+            else:
+                _generate_tiles_shared(maze, cls, nom, tuiles, params, workers)
+        with _phase("gen_tiled", "stitch"):
+            _stitch_tiles(maze, th, tw, rng)
+        return maze
+
+    @_instrumented("improve")
+    def improve(self, end=None, start=(0, 0), edits=10000, objective="path", time_budget=None, target=None,
+                seed=None):
+        """
+        Rend un labyrinthe parfait plus difficile par recherche locale (modifié sur place)
+        Chaque modification proposée ouvre un mur fermé (u, v), ce qui crée un cycle,
+        puis referme un passage de ce cycle : le labyrinthe reste parfait
+        Son effet est évalué sans parcours sur l'arbre enraciné en start :
+          - si a = lca(u, end) et b = lca(v, end) diffèrent (a plus proche de start),
+            refermer un passage du chemin entre a et b donne un chemin de longueur
+            depth[u] + 1 + depth[v] + depth[end] - 2 * depth[b]
+          - la variation du nombre d'impasses ne dépend que des degrés des quatre cellules touchées
+        Une modification n'est appliquée que si elle améliore l'objectif ; l'arbre est suivi
+        par une forêt dynamique (_LinkCutTree) : l'échange de passages coupe le sous-arbre
+        détaché et le rattache en O(log n) amorti, sans parcours ; l'index d'arbre n'est
+        reconstruit qu'une fois, à la fin (s'il y a eu des modifications)
+        :param end: la cellule d'arrivée ((h-1, w-1) par défaut)
+        :param start: la cellule de départ
+        :param edits: nombre de modifications proposées
+        :param objective: "path" (longueur du chemin, puis nombre d'impasses)
+                          ou "dead_ends" (nombre d'impasses, puis longueur du chemin)
+        :param time_budget: durée maximale en secondes (None : pas de limite)
+        :param target: arrête la recherche dès que le chemin atteint cette longueur
+        :param seed: graine (entier) ou instance de random.Random ; None utilise le module random
+        :return: le labyrinthe
+        Les compteurs (modifications proposées et acceptées, longueur finale) sont ensuite
+        disponibles dans self.improve_stats
+        """
+        if objective not in ("path", "dead_ends"):
+            raise ValueError(f"Objectif inconnu : {objective!r}")
+        h, w = self.height, self.width
+        if end is None:
+            end = (h - 1, w - 1)
+        rng = _rng(seed)
+        echeance = None if time_budget is None else time.monotonic() + time_budget
+        cible = end[0] * w + end[1]
+        arbre = _LinkCutTree(self.build_tree_index(start).parent, start[0] * w + start[1])
+        arbre.expose(cible)
+        longueur = arbre.rank(cible)
+        degres = bytearray(self.adjacency().translate(_DEGRE))
+        est, sud = self._east, self._south
+        n = h * w
+        acceptees = proposees = 0
+
+        while proposees < edits:
+            if target is not None and longueur >= target:
+                break
+            if echeance is not None and proposees % 256 == 0 and time.monotonic() >= echeance:
+                break
+            proposees += 1
+            # Un mur intérieur fermé tiré au hasard
+            u = rng.randrange(n)
+            if rng.getrandbits(1):
+                if u % w == w - 1 or not est[u]:
+                    continue
+                v = u + 1
+            else:
+                if u >= n - w or not sud[u]:
+                    continue
+                v = u + w
+            # a = lca(u, end) et b = lca(v, end), avec les profondeurs utiles
+            # (expose rend le plus proche ancêtre commun avec la cellule exposée juste avant)
+            arbre.expose(u)
+            du = arbre.rank(u)
+            a = arbre.expose(cible)
+            da = arbre.rank(a)
+            b = arbre.expose(v)
+            dv, db = arbre.rank(v), arbre.rank(b)
+            if a != b:
+                if da > db:
+                    u, v, a, b, du, dv, da, db = v, u, b, a, dv, du, db, da
+                    arbre.expose(b)
+                # Passage refermé : tiré sur le chemin entre a et b ; le sous-arbre détaché contient v
+                dx = db - rng.randrange(db - da)
+                gain_chemin = du + dv + 1 - 2 * db
+                if gain_chemin < 0:
+                    continue  # refusée quel que soit l'objectif
+                x = arbre.select(dx)
+                y, z = v, u
+            else:
+                # Passage refermé : tiré sur le cycle, hors du chemin
+                c = arbre.expose(u)
+                dc = arbre.rank(c)
+                cote_u = du - dc
+                r = rng.randrange(cote_u + dv - dc)
+                if r < cote_u:
+                    dx = du - r
+                    y, z = u, v
+                else:
+                    arbre.expose(v)
+                    dx = dv - (r - cote_u)
+                    y, z = v, u
+                x = arbre.select(dx)
+                gain_chemin = 0
+            px = arbre.select(dx - 1)
+            # Variation du nombre d'impasses
+            nouveaux = {}
+            for k, d in ((u, 1), (v, 1), (x, -1), (px, -1)):
+                nouveaux[k] = nouveaux.get(k, degres[k]) + d
+            gain_impasses = sum((d == 1) - (degres[k] == 1) for k, d in nouveaux.items())
+            gain = (gain_chemin, gain_impasses) if objective == "path" else (gain_impasses, gain_chemin)
+            if gain <= (0, 0) or (objective == "dead_ends" and gain_chemin < 0):
+                continue
+            self.remove_wall(divmod(u, w), divmod(v, w))
+            self.add_wall(divmod(x, w), divmod(px, w))
+            for k, d in nouveaux.items():
+                degres[k] = d
+            # Le sous-arbre de x, détaché de px, contient y : il est raccroché à z
+            arbre.cut(x)
+            arbre.link(y, z)
+            longueur += gain_chemin
+            acceptees += 1
+
+        if acceptees:
+            self.build_tree_index(start)
+        self.improve_stats = {"proposed": proposees, "accepted": acceptees, "length": longueur}
+        logger.info("improve : %d modifications acceptées sur %d, chemin de longueur %d",
+                    acceptees, proposees, self.improve_stats["length"])
+        return self
 
     @classmethod
-    def gen_hard_maze(cls, h, w, difficulty:int=1000, end:tuple=None):
+    @_instrumented("gen_hard_maze")
+    def gen_hard_maze(cls, h, w, difficulty:int=1000, end:tuple=None, seed=None, workers=1,
+                      time_budget=None, target=None, strategy="sample"):
         """
         Cette méthode génère un labyrinthe compliqué
+        Stratégie "sample" : chaque candidat est un labyrinthe de Wilson généré à partir de sa propre graine,
+        elle-même tirée d'une graine maître : seules les graines et les scores circulent
+        entre les processus, et le gagnant est régénéré à partir de sa graine
+        Stratégie "climb" : un seul labyrinthe de Wilson est amélioré par recherche locale
+        (voir improve), avec difficulty * 100 modifications proposées ; workers est alors ignoré
         :param h: hauteur du labyrinthe
         :param w: largeur du labyrinthe
         :param difficulty: difficulté du labyrinthe (nombre de labyrinthes testés)
         :param end: où est la fin du labyrinthe
+        :param seed: graine maître (entier ou random.Random) ; None utilise le module random
+        :param workers: nombre de processus (1 : recherche séquentielle, None : tous les cœurs)
+        :param time_budget: durée maximale de la recherche en secondes (None : pas de limite)
+        :param target: arrête la recherche dès qu'un chemin de cette longueur est trouvé
+        :param strategy: "sample" (meilleur de difficulty labyrinthes) ou "climb" (recherche locale)
         :return: Le labyrinthe
         """
         if end == None:
             end = (h-1, w-1)
-        biggestMaze = cls.gen_wilson(h, w)
-        longuerMaze = 0
-        for i in range(difficulty):
-            print("search for the labyrinth... ")
-            maze = cls.gen_wilson(h, w)
-            if maze.isPossible((0, 0), end):
-                if maze.distance_geo((0, 0), end) > longuerMaze:
-                    longuerMaze = maze.distance_geo((0, 0), end)
-                    biggestMaze = copy.deepcopy(maze)
-        return biggestMaze
+        if strategy not in ("sample", "climb"):
+            raise ValueError(f"Stratégie inconnue : {strategy!r}")
+        rng = _rng(seed)
+        if strategy == "climb":
+            maze = cls.gen_wilson(h, w, seed=rng.getrandbits(64))
+            return maze.improve(end, edits=difficulty * 100, time_budget=time_budget, target=target,
+                                seed=rng.getrandbits(64))
+        graines = [rng.getrandbits(64) for _ in range(difficulty)]
+        graine_secours = rng.getrandbits(64)
+        echeance = None if time_budget is None else time.monotonic() + time_budget
+
+        # Meilleur résultat sous la forme (longueur, -rang du lot, graine)
+        meilleur = (-1, 0, graine_secours)
+
+        def integrer(rang, resultat):
+            nonlocal meilleur
+            graine, longueur = resultat
+            if graine is not None and (longueur, -rang) > meilleur[:2]:
+                meilleur = (longueur, -rang, graine)
+                logger.debug("gen_hard_maze : nouveau meilleur chemin de longueur %d", longueur)
+
+        def termine():
+            return (target is not None and meilleur[0] >= target) or \
+                (echeance is not None and time.monotonic() >= echeance)
+
+        if workers == 1:
+            # Un seul lot : les tampons de travail de gen_wilson servent à tous les candidats
+            integrer(0, _score_hard_maze(cls, h, w, end, graines, echeance, target))
+        else:
+            nb_processus = workers or os.cpu_count() or 1
+            # Lots de candidats pour répartir la charge ; avec un budget de temps ou une cible,
+            # les lots restent petits pour que les processus s'arrêtent vite une fois la recherche finie
+            taille = max(1, min(64, difficulty // (8 * nb_processus)))
+            if echeance is not None or target is not None:
+                taille = min(taille, 4)
+            executor = ProcessPoolExecutor(max_workers=nb_processus)
+            en_cours = {executor.submit(_score_hard_maze, cls, h, w, end, graines[i:i + taille],
+                                        echeance, target): i
+                        for i in range(0, difficulty, taille)}
+            try:
+                while en_cours and not termine():
+                    delai = None if echeance is None else max(0.0, echeance - time.monotonic())
+                    faits, _ = wait(en_cours, timeout=delai, return_when=FIRST_COMPLETED)
+                    for futur in faits:
+                        integrer(en_cours.pop(futur), futur.result())
+            finally:
+                # Les lots en attente sont annulés et les lots en cours ne sont pas attendus
+                executor.shutdown(wait=not en_cours, cancel_futures=True)
+
+        logger.info("gen_hard_maze : chemin de longueur %d retenu", meilleur[0])
+        with _phase("gen_hard_maze", "regenerate"):
+            return cls.gen_wilson(h, w, seed=meilleur[2])
+
+
+
+def _copy_plane(plane):
+    """
+    :return: une copie modifiable d'un tableau de murs
+    """
+    return bytearray(plane)
+
+
+def _rng(seed):
+    """
+    Cette fonction donne le générateur aléatoire à utiliser pour une graine
+    :param seed: None (module random), un entier ou une instance de random.Random
+    :return: un objet qui fournit l'interface de random.Random
+    """
+    if seed is None:
+        rng = random
+    elif isinstance(seed, random.Random):
+        rng = seed
+    else:
+        rng = random.Random(seed)
+    if _profiler is not None and _profiler._pile:
+        # Tirages comptés au nom de la méthode instrumentée en cours
+        return _CountingRandom(rng, _profiler, _profiler._pile[-1])
+    return rng
+
+
+def _score_hard_maze(cls, h, w, end, graines, echeance=None, target=None):
+    """
+    Évalue une série de candidats de gen_hard_maze (fonction exécutée dans les processus de calcul,
+    ou directement en mode séquentiel) ; les tampons de travail de gen_wilson sont réutilisés
+    d'un candidat à l'autre
+    :param echeance: instant (time.monotonic, commun aux processus) après lequel aucun candidat
+                     n'est plus évalué, None : pas de limite
+    :param target: arrête l'évaluation dès qu'un chemin de cette longueur est trouvé
+    :return: le couple (graine, longueur du chemin de (0, 0) à end) du meilleur candidat,
+             (None, -1) si aucun candidat n'a de chemin
+    """
+    meilleur = (None, -1)
+    tampons = {}
+    for graine in graines:
+        if (target is not None and meilleur[1] >= target) or \
+                (echeance is not None and time.monotonic() >= echeance):
+            break
+        maze = cls.gen_wilson(h, w, seed=graine, _scratch=tampons)
+        longueur = maze.distance_field((0, 0))[end[0] * w + end[1]]
+        if longueur > meilleur[1]:
+            meilleur = (graine, longueur)
+    return meilleur
+
+
+# Segments du rendu texte, indexés par la présence (1) ou l'absence (0) du mur
+_CELLULE = ("    ", "   ┃")
+_SEPARATEUR = ("   ╋", "━━━╋")
+_FIN_SEPARATEUR = ("   ┫\n", "━━━┫\n")
+
+
+def _render_lines(width, rows, content=None):
+    """
+    Générateur des lignes du rendu texte d'un labyrinthe à partir de ses lignes de murs
+    :param width: la largeur du labyrinthe
+    :param rows: itérable de couples (murs est, murs sud) d'une ligne, de longueur width
+    :param content: dictionnaire facultatif {cellule: caractère}
+    :return: les lignes de texte, la première étant le haut du cadre et la dernière le bas
+    """
+    # Regroupement du contenu par ligne pour ne consulter que les lignes concernées
+    par_ligne = {}
+    for (i, j), caractere in (content or {}).items():
+        par_ligne.setdefault(i, {})[j] = caractere
+
+    yield "┏" + "━━━┳" * (width - 1) + "━━━┓\n"
+    sud_precedent = None
+    for i, (est, sud) in enumerate(rows):
+        if sud_precedent is not None:
+            yield "┣" + "".join(map(_SEPARATEUR.__getitem__, sud_precedent[:width - 1])) + \
+                _FIN_SEPARATEUR[sud_precedent[width - 1]]
+        if i in par_ligne:
+            contenu = par_ligne[i]
+            yield "┃" + "".join(" " + contenu.get(j, " ") + (" ┃" if est[j] else "  ")
+                                for j in range(width)) + "\n"
+        else:
+            yield "┃" + "".join(map(_CELLULE.__getitem__, est)) + "\n"
+        sud_precedent = sud
+    yield "┗" + "━━━┻" * (width - 1) + "━━━┛\n"
 
+
+# Format binaire : en-tête fixe suivi du nom du générateur (UTF-8)
+_MAGIC = b"MAZE"
+_FORMAT_VERSION = 1
+_ENTETE = struct.Struct("<4sBIIBQB")
+# Traduction d'une ligne de murs (octets 0 / 1) en chiffres binaires ASCII, et inversement
+_VERS_ASCII = bytes.maketrans(b"\x00\x01", b"01")
+_DEPUIS_ASCII = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _write_header(f, height, width, generator, seed):
+    """
+    Écrit l'en-tête du format binaire dans le fichier f
+    """
+    nom = (generator or "").encode("utf-8")
+    avec_graine = isinstance(seed, int) and 0 <= seed < 1 << 64
+    f.write(_ENTETE.pack(_MAGIC, _FORMAT_VERSION, height, width,
+                         avec_graine, seed if avec_graine else 0, len(nom)))
+    f.write(nom)
+
+
+def _read_header(f):
+    """
+    Lit l'en-tête du format binaire dans le fichier f
+    :return: (hauteur, largeur, générateur, graine, position du début des murs)
+    """
+    magic, version, height, width, avec_graine, seed, taille_nom = _ENTETE.unpack(f.read(_ENTETE.size))
+    if magic != _MAGIC:
+        raise ValueError("Ce fichier n'est pas un labyrinthe enregistré")
+    if version != _FORMAT_VERSION:
+        raise ValueError(f"Version de format non prise en charge : {version}")
+    generator = f.read(taille_nom).decode("utf-8") or None
+    return height, width, generator, seed if avec_graine else None, _ENTETE.size + taille_nom
+
+
+def _pack_bits(row):
+    """
+    Compacte une ligne de murs (un octet 0 / 1 par cellule) en bits, le bit j%8 de l'octet j//8
+    donnant le mur de la cellule j
+    """
+    if not row:
+        return b""
+    return int(bytes(row[::-1]).translate(_VERS_ASCII), 2).to_bytes((len(row) + 7) // 8, "little")
+
+
+def _unpack_bits(data, width):
+    """
+    Opération inverse de _pack_bits : décompacte width bits en une ligne d'octets 0 / 1
+    """
+    if not width:
+        return b""
+    chiffres = format(int.from_bytes(data, "little"), "0%db" % (8 * len(data)))
+    return chiffres[::-1][:width].encode("ascii").translate(_DEPUIS_ASCII)
+
+
+class _MappedPlanes:
+    """
+    Murs d'un fichier enregistré par Maze.save (projeté en mémoire ou lu), décodés à la demande
+    """
+    def __init__(self, data, offset, height, width):
+        self._data = data
+        self._offset = offset
+        self._height = height
+        self._width = width
+
+    def decode(self):
+        """
+        :return: les tableaux d'octets (murs est, murs sud)
+        """
+        octets_ligne = (self._width + 7) // 8
+        est, sud = bytearray(), bytearray()
+        for i in range(self._height):
+            p = self._offset + 2 * octets_ligne * i
+            est += _unpack_bits(self._data[p:p + octets_ligne], self._width)
+            sud += _unpack_bits(self._data[p + octets_ligne:p + 2 * octets_ligne], self._width)
+        return est, sud
+
+
+def _close_border(east, south, height, width):
+    """
+    Referme les murs extérieurs (dernière colonne des murs est, dernière ligne des murs sud)
+    s'ils sont ouverts : un tableau d'octets modifiable est corrigé sur place,
+    un tableau immuable (bytes) est remplacé par une copie corrigée, elle aussi immuable
+    :return: le couple (murs est, murs sud)
+    """
+    n = height * width
+    if n == 0:
+        return east, south
+    if east[width - 1::width].count(0):
+        corrige = east if isinstance(east, bytearray) else bytearray(east)
+        corrige[width - 1::width] = b"\x01" * height
+        east = corrige if isinstance(east, bytearray) else bytes(corrige)
+    if south[n - width:].count(0):
+        corrige = south if isinstance(south, bytearray) else bytearray(south)
+        corrige[n - width:] = b"\x01" * width
+        south = corrige if isinstance(south, bytearray) else bytes(corrige)
+    return east, south
+
+
+# Une table de 1000 x 1000 occupe environ 20 Mo : seules les deux dernières tailles sont gardées,
+# les séries de générations (generate_many, gen_tiled) gardent la leur dans leurs tampons de travail
+@functools.lru_cache(maxsize=2)
+def _grid_adjacency(h, w):
+    """
+    Voisinage de la grille h x w au format CSR (compressed sparse row), partagé par tous
+    les labyrinthes de cette taille : les voisines de la cellule k sont
+    voisins[debut[k]:debut[k + 1]], dans l'ordre haut, bas, gauche, droite
+    Les lignes sont construites à partir de trois modèles (première, intérieure, dernière)
+    décalés du numéro de leur première cellule
+    :return: le couple (debut, voisins) de tableaux d'entiers, à ne pas modifier
+    """
+    modeles = {}
+    voisins = array("i")
+    degres = bytearray()
+    for i in range(h):
+        cle = (i > 0, i < h - 1)
+        if cle not in modeles:
+            modele, degres_modele = [], bytearray()
+            for j in range(w):
+                ligne = [-w + j] * cle[0] + [w + j] * cle[1] + [j - 1] * (j > 0) + [j + 1] * (j < w - 1)
+                modele += ligne
+                degres_modele.append(len(ligne))
+            modeles[cle] = modele, degres_modele
+        modele, degres_modele = modeles[cle]
+        voisins.extend(map((i * w).__add__, modele))
+        degres += degres_modele
+    return array("i", itertools.accumulate(degres, initial=0)), voisins
+
+
+@functools.lru_cache(maxsize=8)
+def _grid_mask(h, w):
+    """
+    :return: pour chaque cellule de la grille h x w, le masque des directions qui restent
+             dans la grille (masque d'adjacence du labyrinthe vide), partagé par tous
+             les labyrinthes de cette taille, à ne pas modifier
+    """
+    if h == 0 or w == 0:
+        return b""
+    ligne = bytearray([GAUCHE | DROITE]) * w
+    ligne[0] &= ~GAUCHE
+    ligne[w - 1] &= ~DROITE
+    if h == 1:
+        return bytes(ligne)
+    return bytes(b | BAS for b in ligne) + bytes(b | HAUT | BAS for b in ligne) * (h - 2) + \
+        bytes(b | HAUT for b in ligne)
+
+
+@functools.lru_cache(maxsize=4)
+def _identite(n):
+    """
+    :return: le tableau 0, 1, ..., n-1 (modèle recopié par UnionFind et IndexableSet, à ne pas modifier)
+    """
+    return array("i", range(n))
+
+
+def _scratch_buffer(scratch, name, factory, reset=True):
+    """
+    Cette fonction fournit un tampon de travail à un générateur
+    Un bytearray réutilisé est remis à zéro par copie d'un modèle nul gardé dans scratch
+    (aucune allocation après le premier appel)
+    :param scratch: dictionnaire des tampons réutilisables, ou None pour allouer un nouveau tampon
+    :param name: le nom du tampon dans scratch
+    :param factory: fonction qui crée le tampon
+    :param reset: False si le générateur écrit chaque case avant de la lire (pas de remise à zéro)
+    :return: le tampon, remis dans son état initial s'il est réutilisé
+    """
+    if scratch is None:
+        return factory()
+    tampon = scratch.get(name)
+    if tampon is None:
+        tampon = scratch[name] = factory()
+    elif not reset:
+        pass
+    elif isinstance(tampon, bytearray):
+        zeros = scratch.get(("zeros", len(tampon)))
+        if zeros is None:
+            zeros = scratch[("zeros", len(tampon))] = bytes(len(tampon))
+        tampon[:] = zeros
+    else:
+        tampon.reset()
+    return tampon
+
+
+# Générateurs qui acceptent des tampons de travail réutilisables
+_AVEC_TAMPONS = {"gen_fusion", "gen_exploration", "gen_wilson"}
+
+
+def _generate(cls, nom, h, w, graine, params, tampons):
+    """
+    Génère un labyrinthe avec le générateur nom et la graine donnée
+    """
+    if nom in _AVEC_TAMPONS:
+        return getattr(cls, nom)(h, w, seed=graine, _scratch=tampons, **params)
+    return getattr(cls, nom)(h, w, seed=graine, **params)
+
+
+def _generate_packed(cls, nom, h, w, graines, params):
+    """
+    Génère une série de labyrinthes (fonction exécutée dans les processus de calcul)
+    :return: pour chaque graine, le triplet (graine, murs est, murs sud) sous forme d'octets
+    """
+    tampons = {}
+    resultat = []
+    for graine in graines:
+        maze = _generate(cls, nom, h, w, graine, params, tampons)
+        resultat.append((graine, bytes(maze._east), bytes(maze._south)))
+    return resultat
+
+
+def _unpack_batch(cls, nom, h, w, lot):
+    """
+    Reconstruit les labyrinthes d'une série produite par _generate_packed
+    """
+    for graine, est, sud in lot:
+        maze = cls._from_planes(h, w, bytearray(est), bytearray(sud))
+        maze.generator = nom[len("gen_"):]
+        maze.seed = graine
+        yield maze
+
+
+def _write_tile(est, sud, cls, nom, w, tuile, params, tampons=None):
+    """
+    Génère une tuile et recopie ses murs, ligne par ligne, dans les plans est / sud
+    du grand labyrinthe (tableaux d'octets ou mémoire partagée) ; les murs du bord
+    de la tuile restent fermés
+    """
+    i0, j0, th, tw, graine = tuile
+    if tampons is not None:
+        # Les tuiles du bord peuvent être plus petites : un jeu de tampons par taille
+        tampons = tampons.setdefault((th, tw), {})
+    petit = _generate(cls, nom, th, tw, graine, params, tampons)
+    for r in range(th):
+        debut = (i0 + r) * w + j0
+        est[debut:debut + tw] = petit._east[r * tw:(r + 1) * tw]
+        sud[debut:debut + tw] = petit._south[r * tw:(r + 1) * tw]
+
+
+def _generate_tile_shared(cls, nom, noms_memoire, w, lot, params):
+    """
+    Génère une série de tuiles dans les plans partagés (fonction exécutée dans les processus de calcul)
+    :return: le nombre de tuiles écrites
+    """
+    memoires = [SharedMemory(name=nom_memoire) for nom_memoire in noms_memoire]
+    try:
+        est, sud = (memoire.buf for memoire in memoires)
+        tampons = {}
+        for tuile in lot:
+            _write_tile(est, sud, cls, nom, w, tuile, params, tampons)
+        del est, sud
+    finally:
+        for memoire in memoires:
+            memoire.close()
+    return len(lot)
+
+
+def _generate_tiles_shared(maze, cls, nom, tuiles, params, workers):
+    """
+    Répartit la génération des tuiles entre plusieurs processus : les murs sont écrits
+    dans deux blocs de mémoire partagée (est, sud), recopiés ensuite dans le labyrinthe
+    """
+    n = maze.height * maze.width
+    memoires = [SharedMemory(create=True, size=max(n, 1)) for _ in range(2)]
+    try:
+        for memoire in memoires:
+            memoire.buf[:n] = b"\x01" * n
+        nb_processus = workers or os.cpu_count() or 1
+        taille = max(1, len(tuiles) // (4 * nb_processus))
+        noms_memoire = [memoire.name for memoire in memoires]
+        with ProcessPoolExecutor(max_workers=nb_processus) as executor:
+            lots = [executor.submit(_generate_tile_shared, cls, nom, noms_memoire, maze.width,
+                                    tuiles[p:p + taille], params)
+                    for p in range(0, len(tuiles), taille)]
+            for lot in lots:
+                lot.result()
+        maze._east = bytearray(memoires[0].buf[:n])
+        maze._south = bytearray(memoires[1].buf[:n])
+    finally:
+        for memoire in memoires:
+            memoire.close()
+            memoire.unlink()
+
+
+def _stitch_tiles(maze, th, tw, rng):
+    """
+    Relie les tuiles (chacune parfaite) : les frontières entre tuiles voisines sont examinées
+    dans un ordre aléatoire et un mur tiré au hasard est cassé sur chaque frontière qui relie
+    deux groupes de tuiles encore séparés, soit exactement (nombre de tuiles - 1) murs
+    """
+    h, w = maze.height, maze.width
+    nb_lignes, nb_colonnes = -(-h // th), -(-w // tw)
+    # Frontières : (tuile, tuile voisine, True si la voisine est à droite)
+    frontieres = [(a * nb_colonnes + b, a * nb_colonnes + b + 1, True)
+                  for a in range(nb_lignes) for b in range(nb_colonnes - 1)]
+    frontieres += [(a * nb_colonnes + b, (a + 1) * nb_colonnes + b, False)
+                   for a in range(nb_lignes - 1) for b in range(nb_colonnes)]
+    rng.shuffle(frontieres)
+    groupes = UnionFind(nb_lignes * nb_colonnes)
+    for t1, t2, horizontale in frontieres:
+        if not groupes.union(t1, t2):
+            continue
+        a, b = divmod(t1, nb_colonnes)
+        if horizontale:
+            # Mur est d'une cellule de la dernière colonne de la tuile t1
+            i = a * th + rng.randrange(min(th, h - a * th))
+            maze._east[i * w + (b + 1) * tw - 1] = 0
+        else:
+            # Mur sud d'une cellule de la dernière ligne de la tuile t1
+            j = b * tw + rng.randrange(min(tw, w - b * tw))
+            maze._south[((a + 1) * th - 1) * w + j] = 0
+
+
+# Nombre de lignes traitées à la fois par les générateurs vectorisés
+_LIGNES_PAR_BLOC = 256
+
+
+def _use_numpy(vectorized):
+    """
+    :param vectorized: True, False ou None (automatique)
+    :return: True si le chemin NumPy doit être utilisé
+    """
+    if vectorized and np is None:
+        raise ImportError("NumPy est nécessaire pour la génération vectorisée")
+    return np is not None if vectorized is None else bool(vectorized)
+
+
+def _sidewinder_draws(rng, w):
+    """
+    Tirages aléatoires d'une ligne de sidewinder
+    :return: (pile ou face des w-1 premières cellules sous forme d'entier, bit j pour la cellule j,
+              entiers de 32 bits petit-boutistes servant à choisir la cellule de chaque séquence)
+    """
+    tirage = rng.getrandbits(w - 1)
+    nb_sequences = w - tirage.bit_count()
+    return tirage, rng.getrandbits(32 * nb_sequences).to_bytes(4 * nb_sequences, "little")
+
+
+def _sidewinder_rows(rng, w, h=None):
+    """
+    Lignes de murs de sidewinder produites une par une (voir Maze.stream_rows)
+    Les tirages sont ceux de gen_sidewinder : les deux donnent le même labyrinthe pour une même graine
+    """
+    est_ligne = b"\x01" * w
+    i = 0
+    while h is None or i < h - 1:
+        tirage, choix = _sidewinder_draws(rng, w)
+        choix = struct.unpack("<%dI" % (len(choix) // 4), choix)
+        est, sud = bytearray(est_ligne), bytearray(est_ligne)
+        debut = 0  # première cellule de la séquence en cours
+        t = 0
+        for j in range(w):
+            if j < w - 1 and tirage >> j & 1:  # si c'est pile
+                est[j] = 0
+            else:
+                # Casser le mur SUD d'une cellule aléatoire dans la séquence
+                sud[debut + (choix[t] * (j - debut + 1) >> 32)] = 0
+                t += 1
+                debut = j + 1
+        yield bytes(est), bytes(sud)
+        i += 1
+    if h:
+        # Dernière ligne : un seul couloir
+        yield b"\x00" * (w - 1) + b"\x01", est_ligne
+
+
+def _eller_rows(rng, w, h=None):
+    """
+    Lignes de murs de l'algorithme d'Eller produites une par une (voir Maze.stream_rows)
+    Seules les étiquettes d'ensemble de la ligne courante sont conservées ; la fusion de deux
+    ensembles réétiquette le plus petit, ce qui borne le travail par ligne à O(w log w)
+    """
+    etiquettes = list(range(w))
+    membres = {j: [j] for j in range(w)}
+    prochaine = w  # prochaine étiquette libre
+    i = 0
+    while h is None or i < h:
+        derniere = h is not None and i == h - 1
+        est = bytearray(b"\x01" * w)
+        # Fusions horizontales : aléatoires, ou systématiques sur la dernière ligne
+        tirage = -1 if derniere else rng.getrandbits(max(w - 1, 1))
+        for j in range(w - 1):
+            a, b = etiquettes[j], etiquettes[j + 1]
+            if a != b and tirage >> j & 1:
+                est[j] = 0
+                if len(membres[a]) < len(membres[b]):
+                    a, b = b, a
+                for k in membres[b]:
+                    etiquettes[k] = a
+                membres[a] += membres.pop(b)
+        if derniere:
+            yield bytes(est), b"\x01" * w
+            return
+        # Passages vers le bas : chaque cellule descend avec une chance sur deux,
+        # et chaque ensemble descend au moins une fois
+        sud = bytearray(b"\x01" * w)
+        descentes = rng.getrandbits(w)
+        suivants = {}
+        for etiquette, cellules in membres.items():
+            bas = [k for k in cellules if descentes >> k & 1]
+            if not bas:
+                bas = [cellules[rng.randrange(len(cellules))]]
+            for k in bas:
+                sud[k] = 0
+            suivants[etiquette] = bas
+        yield bytes(est), bytes(sud)
+        # Ligne suivante : les cellules atteintes par le haut gardent leur ensemble,
+        # les autres forment chacune un nouvel ensemble
+        membres = suivants
+        for j in range(w):
+            if sud[j]:
+                etiquettes[j] = prochaine
+                membres[prochaine] = [j]
+                prochaine += 1
+        i += 1
+
+
+def _bits_rows(tirages, w):
+    """
+    Convertit des tirages d'une ligne (entiers de w-1 bits) en une matrice de bits
+    :return: tableau NumPy de forme (len(tirages), w - 1)
+    """
+    octets = (w - 1 + 7) // 8
+    donnees = np.frombuffer(b"".join(t.to_bytes(octets, "little") for t in tirages), dtype=np.uint8)
+    return np.unpackbits(donnees.reshape(len(tirages), octets), axis=1, bitorder="little")[:, :w - 1]
+
+
+def _btree_numpy(maze, rng):
+    """
+    Version vectorisée de gen_btree : mêmes tirages, écrits directement dans les tableaux de murs
+    """
+    h, w = maze.height, maze.width
+    est = np.frombuffer(maze._east, dtype=np.uint8).reshape(h, w)
+    sud = np.frombuffer(maze._south, dtype=np.uint8).reshape(h, w)
+    for debut in range(0, h - 1, _LIGNES_PAR_BLOC):
+        fin = min(debut + _LIGNES_PAR_BLOC, h - 1)
+        tirages = [rng.getrandbits(w - 1) for _ in range(debut, fin)]
+        if w > 1:
+            bits = _bits_rows(tirages, w)
+            est[debut:fin, :w - 1] = 1 - bits
+            sud[debut:fin, :w - 1] = bits
+        sud[debut:fin, w - 1] = 0
+    est[h - 1, :w - 1] = 0
+
+
+def _sidewinder_numpy(maze, rng):
+    """
+    Version vectorisée de gen_sidewinder : mêmes tirages, les séquences étant repérées
+    par leurs cellules de fin et la cellule choisie calculée pour toutes les séquences à la fois
+    """
+    h, w = maze.height, maze.width
+    est = np.frombuffer(maze._east, dtype=np.uint8).reshape(h, w)
+    sud = np.frombuffer(maze._south, dtype=np.uint8)
+    for debut in range(0, h - 1, _LIGNES_PAR_BLOC):
+        fin = min(debut + _LIGNES_PAR_BLOC, h - 1)
+        tirages, choix = [], []
+        for _ in range(debut, fin):
+            tirage, mots = _sidewinder_draws(rng, w)
+            tirages.append(tirage)
+            choix.append(mots)
+        # pile[i, j] vaut 1 si la séquence continue vers l'est après la cellule (i, j)
+        pile = np.zeros((fin - debut, w), dtype=np.uint8)
+        if w > 1:
+            pile[:, :w - 1] = _bits_rows(tirages, w)
+            est[debut:fin, :w - 1] = 1 - pile[:, :w - 1]
+        fins = np.flatnonzero(pile.ravel() == 0)
+        debuts = np.empty_like(fins)
+        debuts[0] = 0
+        debuts[1:] = fins[:-1] + 1
+        longueurs = (fins - debuts + 1).astype(np.uint64)
+        mots = np.frombuffer(b"".join(choix), dtype="<u4").astype(np.uint64)
+        decalages = (mots * longueurs) >> np.uint64(32)
+        sud[debut * w + debuts + decalages.astype(np.int64)] = 0
+    est[h - 1, :w - 1] = 0
@@ -0,0 +1,171 @@
+"""
+Analyses vectorisées d'un lot de labyrinthes de même taille (NumPy est nécessaire)
+
+Un lot est un tableau NumPy d'octets de forme (n, h, w) : pour chaque labyrinthe,
+le masque des directions ouvertes de chaque cellule (bits HAUT, BAS, GAUCHE, DROITE,
+comme Maze.adjacency). Les indicateurs sont calculés pour tous les labyrinthes à la fois
+et rendus sous forme de tableaux de longueur n :
+  - dead_end_counts : somme vectorisée des degrés ;
+  - distance_fields : parcours en largeur de tous les labyrinthes ensemble, un front à la fois,
+    le front étant la liste des numéros globaux (labyrinthe * h * w + cellule) des cellules atteintes ;
+  - dead_end_fill : comblement des impasses de tous les labyrinthes, un front à la fois.
+
+Exemple :
+    masques = stack(Maze.generate_many("wilson", 20, 20, 1000, seed=1))
+    scores = score(masques, end=(19, 19))
+"""
+import numpy as np
+
+from Maze import BAS, DROITE, GAUCHE, HAUT
+
+
+def stack(mazes):
+    """
+    Empile les masques d'adjacence d'une série de labyrinthes de même taille
+    :param mazes: itérable de labyrinthes
+    :return: tableau d'octets de forme (n, h, w)
+    """
+    masques = [np.frombuffer(bytes(maze.adjacency()), dtype=np.uint8).reshape(maze.height, maze.width)
+               for maze in mazes]
+    if not masques:
+        raise ValueError("Le lot de labyrinthes est vide")
+    return np.stack(masques)
+
+
+def masks_from_walls(east, south):
+    """
+    Calcule les masques d'adjacence à partir de tableaux de murs (1 = mur), comme Maze.adjacency
+    :param east: murs est, de forme (n, h, w)
+    :param south: murs sud, de forme (n, h, w)
+    :return: tableau d'octets de forme (n, h, w)
+    """
+    est = np.asarray(east, dtype=bool)
+    sud = np.asarray(south, dtype=bool)
+    # Les murs extérieurs sont toujours fermés, quel que soit le contenu des tableaux
+    ouvert_est = ~est
+    ouvert_est[:, :, -1] = False
+    ouvert_sud = ~sud
+    ouvert_sud[:, -1, :] = False
+    masques = np.where(ouvert_sud, BAS, 0).astype(np.uint8)
+    masques |= np.where(ouvert_est, DROITE, 0).astype(np.uint8)
+    masques[:, 1:, :] |= np.where(ouvert_sud[:, :-1, :], HAUT, 0).astype(np.uint8)
+    masques[:, :, 1:] |= np.where(ouvert_est[:, :, :-1], GAUCHE, 0).astype(np.uint8)
+    return masques
+
+
+def _degrees(masks):
+    m = np.asarray(masks, dtype=np.uint8)
+    return (m & 1) + (m >> 1 & 1) + (m >> 2 & 1) + (m >> 3 & 1)
+
+
+def dead_end_counts(masks):
+    """
+    :param masks: lot de masques, de forme (n, h, w)
+    :return: le nombre de culs-de-sac de chaque labyrinthe (comme Maze.dead_end_number)
+    """
+    return np.count_nonzero(_degrees(masks) == 1, axis=(1, 2))
+
+
+def distance_fields(masks, source=(0, 0)):
+    """
+    Parcours en largeur depuis source dans tous les labyrinthes du lot à la fois
+    À chaque étape, les cellules du front sont développées direction par direction
+    (une cellule déjà atteinte est écartée avant la direction suivante : pas de doublons)
+    :param masks: lot de masques, de forme (n, h, w)
+    :param source: la cellule de départ (l, c), la même pour tous les labyrinthes
+    :return: tableau d'entiers de forme (n, h, w) : distance à source, -1 si inaccessible
+    """
+    masques = np.ascontiguousarray(masks, dtype=np.uint8)
+    n, h, w = masques.shape
+    plat = masques.reshape(-1)
+    dist = np.full(n * h * w, -1, dtype=np.int32)
+    front = np.arange(n, dtype=np.int64) * (h * w) + source[0] * w + source[1]
+    dist[front] = 0
+    directions = ((HAUT, -w), (BAS, w), (GAUCHE, -1), (DROITE, 1))
+    d = 0
+    while front.size:
+        d += 1
+        ouverts = plat[front]
+        suivants = []
+        for bit, decalage in directions:
+            voisines = front[(ouverts & bit) != 0] + decalage
+            voisines = voisines[dist[voisines] < 0]
+            dist[voisines] = d
+            suivants.append(voisines)
+        front = np.concatenate(suivants)
+    return dist.reshape(n, h, w)
+
+
+def dead_end_fill(masks, start=(0, 0), end=None):
+    """
+    Comble les impasses de tous les labyrinthes du lot à la fois (comme la méthode "fill" de Maze.solve) :
+    à chaque étape, toutes les impasses du front sont comblées puis le degré de leurs voisines diminue ;
+    il ne reste que le couloir de la solution (et les boucles)
+    Le nombre d'étapes est la longueur de la plus longue impasse du lot
+    :param masks: lot de masques, de forme (n, h, w)
+    :param start: la cellule de départ (jamais comblée)
+    :param end: la cellule d'arrivée ((h-1, w-1) par défaut, jamais comblée)
+    :return: tableau de booléens de forme (n, h, w), True pour les cellules comblées
+    """
+    masques = np.ascontiguousarray(masks, dtype=np.uint8)
+    n, h, w = masques.shape
+    if end is None:
+        end = (h - 1, w - 1)
+    plat = masques.reshape(-1)
+    degres = _degrees(plat).astype(np.int16)
+    comblee = np.zeros(plat.size, dtype=bool)
+    protegee = np.zeros(plat.size, dtype=bool)
+    debuts = np.arange(n, dtype=np.int64) * (h * w)
+    protegee[debuts + start[0] * w + start[1]] = True
+    protegee[debuts + end[0] * w + end[1]] = True
+    directions = ((HAUT, -w), (BAS, w), (GAUCHE, -1), (DROITE, 1))
+    front = np.flatnonzero((degres == 1) & ~protegee)
+    while front.size:
+        comblee[front] = True
+        ouverts = plat[front]
+        touchees = []
+        for bit, decalage in directions:
+            voisines = front[(ouverts & bit) != 0] + decalage
+            voisines = voisines[~comblee[voisines]]
+            np.subtract.at(degres, voisines, 1)
+            touchees.append(voisines)
+        touchees = np.unique(np.concatenate(touchees))
+        front = touchees[(degres[touchees] <= 1) & ~protegee[touchees]]
+    return comblee.reshape(n, h, w)
+
+
+def worst_path_lens(masks, fields=None):
+    """
+    :param masks: lot de masques, de forme (n, h, w)
+    :param fields: champs de distances depuis (0, 0) s'ils sont déjà calculés (voir distance_fields)
+    :return: pour chaque labyrinthe, la longueur (en cellules) du plus long chemin
+             de (0, 0) à une impasse accessible (comme Maze.worst_path_len)
+    """
+    if fields is None:
+        fields = distance_fields(masks)
+    impasses = (_degrees(masks) == 1) & (fields >= 0)
+    return np.where(impasses, fields + 1, 0).max(axis=(1, 2))
+
+
+def score(masks, start=(0, 0), end=None):
+    """
+    Calcule les indicateurs de difficulté de tous les labyrinthes du lot
+    (un seul parcours en largeur groupé depuis start)
+    :param masks: lot de masques, de forme (n, h, w)
+    :param start: la cellule de départ
+    :param end: la cellule d'arrivée ((h-1, w-1) par défaut)
+    :return: dictionnaire de tableaux de longueur n :
+             "dead_end_number", "worst_path_len" (depuis (0, 0)),
+             "distance_geo" (de start à end, -1 si inaccessible) et "distance_man"
+    """
+    n, h, w = np.shape(masks)
+    if end is None:
+        end = (h - 1, w - 1)
+    champs = distance_fields(masks, start)
+    depuis_origine = champs if tuple(start) == (0, 0) else distance_fields(masks)
+    return {
+        "dead_end_number": dead_end_counts(masks),
+        "worst_path_len": worst_path_lens(masks, depuis_origine),
+        "distance_geo": champs[:, end[0], end[1]].copy(),
+        "distance_man": np.full(n, abs(start[0] - end[0]) + abs(start[1] - end[1])),
+    }
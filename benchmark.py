@@ -0,0 +1,215 @@
+"""
+Banc d'essai des performances de la classe Maze
+
+Chaque mesure (générateurs, solveurs, analyses, rendu texte) est exécutée sur une
+échelle de tailles ; on enregistre le temps (meilleur de plusieurs essais), le pic
+mémoire (tracemalloc) et le nombre de cellules traitées par seconde.
+
+Utilisation :
+    python benchmark.py run --sizes 10,100,1000 --output resultats.json
+    python benchmark.py run --compare reference.json
+    python benchmark.py compare reference.json resultats.json --threshold 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from Maze import Maze
+
+TAILLES = (10, 30, 100, 300, 1000)
+GRAINE = 2024
+
+# Labyrinthes de référence (un par taille) utilisés par les solveurs et les analyses
+_labyrinthes = {}
+
+
+def _labyrinthe(n):
+    """
+    :return: le labyrinthe parfait de référence de taille n x n
+    """
+    if n not in _labyrinthes:
+        _labyrinthes[n] = Maze.gen_exploration(n, n, seed=GRAINE)
+    return _labyrinthes[n]
+
+
+def _generateur(nom):
+    return lambda n: (lambda: getattr(Maze, nom)(n, n, seed=GRAINE))
+
+
+def _sur_labyrinthe(action):
+    return lambda n: (lambda maze=_labyrinthe(n): action(maze, n))
+
+
+def _hard_maze(difficulte, strategie="sample"):
+    return lambda n: (lambda: Maze.gen_hard_maze(n, n, difficulte, seed=GRAINE, strategy=strategie))
+
+
+def _vers_null(enregistrer):
+    with open(os.devnull, "wb") as f:
+        enregistrer(f)
+
+
+def mesures(difficulte_hard_maze=5):
+    """
+    :return: dictionnaire {nom de la mesure: fonction qui, pour une taille n, prépare la fonction à chronométrer}
+    """
+    coin = lambda n: (n - 1, n - 1)
+    return {
+        "gen_btree": _generateur("gen_btree"),
+        "gen_sidewinder": _generateur("gen_sidewinder"),
+        "gen_fusion": _generateur("gen_fusion"),
+        "gen_exploration": _generateur("gen_exploration"),
+        "gen_wilson": _generateur("gen_wilson"),
+        "gen_eller": _generateur("gen_eller"),
+        "gen_hard_maze": _hard_maze(difficulte_hard_maze),
+        "gen_hard_maze_climb": _hard_maze(difficulte_hard_maze, "climb"),
+        "solve_dfs": _sur_labyrinthe(lambda m, n: m.solve_dfs((0, 0), coin(n))),
+        "solve_bfs": _sur_labyrinthe(lambda m, n: m.solve_bfs((0, 0), coin(n))),
+        "solve_rhr": _sur_labyrinthe(lambda m, n: m.solve_rhr((0, 0), coin(n))),
+        "solve_fill": _sur_labyrinthe(lambda m, n: m.solve((0, 0), coin(n), "fill")),
+        # Les caches de distances sont vidés pour mesurer le calcul et non la lecture du cache
+        "distance_geo": _sur_labyrinthe(lambda m, n: (m.distances.clear(), m.distance_geo((0, 0), coin(n)))),
+        "worst_path_len": _sur_labyrinthe(lambda m, n: (m.distances.clear(), m.worst_path_len())),
+        "dead_end_number": _sur_labyrinthe(lambda m, n: m.dead_end_number()),
+        # Modification d'un mur puis lecture du masque d'adjacence (mis à jour sur place)
+        "edit_adjacency": _sur_labyrinthe(lambda m, n: (m.remove_wall((0, 0), (0, 1)), m.adjacency(),
+                                                        m.add_wall((0, 0), (0, 1)), m.adjacency())),
+        "__str__": _sur_labyrinthe(lambda m, n: str(m)),
+        "save_png": _sur_labyrinthe(lambda m, n: _vers_null(m.save_png)),
+        "save_ppm": _sur_labyrinthe(lambda m, n: _vers_null(m.save_ppm)),
+    }
+
+
+def mesurer(fonction, essais, memoire=True):
+    """
+    Chronomètre une fonction
+    :param fonction: la fonction à mesurer (sans argument)
+    :param essais: nombre d'exécutions, le meilleur temps est retenu
+    :param memoire: si True, une exécution supplémentaire mesure le pic mémoire
+    :return: (meilleur temps en secondes, pic mémoire en octets ou None)
+    """
+    meilleur = float("inf")
+    for _ in range(essais):
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+    pic = None
+    if memoire:
+        tracemalloc.start()
+        try:
+            fonction()
+            pic = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return meilleur, pic
+
+
+def executer(tailles=TAILLES, selection=None, essais=3, memoire=True, difficulte_hard_maze=5, sortie=sys.stderr):
+    """
+    Exécute les mesures sur l'échelle de tailles
+    :param tailles: côtés des labyrinthes (carrés) à mesurer
+    :param selection: noms des mesures à exécuter (None : toutes)
+    :param essais: nombre d'exécutions par mesure
+    :param memoire: mesurer aussi le pic mémoire
+    :param difficulte_hard_maze: nombre de candidats de gen_hard_maze
+    :param sortie: flux où écrire la progression (None : silencieux)
+    :return: dictionnaire des résultats, sérialisable en JSON
+    """
+    resultats = {}
+    for nom, preparer in mesures(difficulte_hard_maze).items():
+        if selection is not None and nom not in selection:
+            continue
+        resultats[nom] = {}
+        for n in tailles:
+            temps, pic = mesurer(preparer(n), essais, memoire)
+            resultats[nom][str(n)] = {
+                "seconds": temps,
+                "peak_bytes": pic,
+                "cells_per_second": n * n / temps if temps > 0 else None,
+            }
+            if sortie is not None:
+                pic_txt = "" if pic is None else f" {pic / 1e6:9.2f} Mo"
+                print(f"{nom:16s} {n:5d}x{n:<5d} {temps:10.4f} s{pic_txt}", file=sortie)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": resultats,
+    }
+
+
+def comparer(reference, courant, seuil=0.2):
+    """
+    Compare deux séries de résultats
+    :param reference: résultats de référence (dictionnaire produit par executer)
+    :param courant: résultats à évaluer
+    :param seuil: ralentissement relatif toléré (0.2 : 20 %)
+    :return: la liste des régressions (nom, taille, temps de référence, temps courant)
+    """
+    regressions = []
+    for nom, par_taille in courant["results"].items():
+        for taille, mesure in par_taille.items():
+            ancienne = reference["results"].get(nom, {}).get(taille)
+            if ancienne is None:
+                continue
+            if mesure["seconds"] > ancienne["seconds"] * (1 + seuil):
+                regressions.append((nom, taille, ancienne["seconds"], mesure["seconds"]))
+    return regressions
+
+
+def _afficher_regressions(regressions, seuil):
+    if not regressions:
+        print(f"Aucune régression (seuil {seuil:.0%})")
+        return 0
+    for nom, taille, avant, apres in regressions:
+        print(f"RÉGRESSION {nom} {taille}x{taille} : {avant:.4f} s -> {apres:.4f} s (x{apres / avant:.2f})")
+    return 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    run = commandes.add_parser("run", help="exécuter les mesures")
+    run.add_argument("--sizes", default=",".join(map(str, TAILLES)),
+                     help="côtés des labyrinthes, séparés par des virgules")
+    run.add_argument("--only", default=None, help="noms des mesures à exécuter, séparés par des virgules")
+    run.add_argument("--repeat", type=int, default=3, help="nombre d'exécutions par mesure")
+    run.add_argument("--no-memory", action="store_true", help="ne pas mesurer le pic mémoire")
+    run.add_argument("--hard-difficulty", type=int, default=5, help="nombre de candidats de gen_hard_maze")
+    run.add_argument("--output", default=None, help="fichier JSON où écrire les résultats")
+    run.add_argument("--compare", default=None, help="fichier JSON de référence")
+    run.add_argument("--threshold", type=float, default=0.2, help="ralentissement toléré")
+
+    compare = commandes.add_parser("compare", help="comparer deux fichiers de résultats")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=0.2, help="ralentissement toléré")
+
+    args = parser.parse_args(argv)
+    if args.commande == "compare":
+        with open(args.baseline) as f:
+            reference = json.load(f)
+        with open(args.current) as f:
+            courant = json.load(f)
+        return _afficher_regressions(comparer(reference, courant, args.threshold), args.threshold)
+
+    tailles = [int(t) for t in args.sizes.split(",")]
+    selection = None if args.only is None else set(args.only.split(","))
+    resultats = executer(tailles, selection, args.repeat, not args.no_memory, args.hard_difficulty)
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(resultats, f, indent=2)
+    if args.compare is not None:
+        with open(args.compare) as f:
+            reference = json.load(f)
+        return _afficher_regressions(comparer(reference, resultats, args.threshold), args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
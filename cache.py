@@ -0,0 +1,192 @@
+"""
+Cache des labyrinthes générés, indexé par (algorithme, hauteur, largeur, graine, paramètres)
+
+Deux niveaux :
+  - en mémoire, un cache LRU borné qui conserve les tableaux de murs sous forme d'octets ;
+  - sur disque (facultatif), un stockage adressé par contenu : les murs de chaque labyrinthe
+    sont enregistrés au format de Maze.save, sans générateur ni graine dans l'en-tête,
+    dans objects/<empreinte du fichier>.maze, et keys/<empreinte de la clé> contient
+    l'empreinte du fichier correspondant (deux clés qui produisent les mêmes murs,
+    par exemple "hard_maze" et le "wilson" de la graine gagnante, partagent le même fichier).
+
+Les labyrinthes sont remis sous forme de FrozenMaze : des vues immuables qui partagent
+les murs du cache, si bien qu'un appelant ne peut pas corrompre le cache. Leurs attributs
+generator et seed sont ceux de la clé demandée (par exemple "hard_maze" et la graine maître),
+et non ceux du labyrinthe produit en interne.
+"""
+import hashlib
+import io
+import os
+from collections import OrderedDict
+
+from Maze import Maze
+
+# Paramètres qui ne changent pas le labyrinthe produit (exclus de la clé)
+_SANS_EFFET = {"workers"}
+
+
+class FrozenMaze(Maze):
+    """
+    Labyrinthe en lecture seule : les tableaux de murs sont des octets immuables
+    (partagés avec le cache) et les méthodes qui modifient les murs lèvent TypeError
+    Toutes les méthodes de lecture (solveurs, analyses, rendu) restent disponibles ;
+    clone donne une copie modifiable
+    """
+    def _immuable(self, *args, **kwargs):
+        raise TypeError("Ce labyrinthe est en lecture seule (utiliser clone pour le modifier)")
+
+    add_wall = remove_wall = fill = empty = restore = improve = _immuable
+
+    def clone(self):
+        """
+        :return: une copie modifiable (Maze) du labyrinthe
+        """
+        maze = Maze._from_planes(self.height, self.width, bytearray(self._east), bytearray(self._south))
+        maze.generator = self.generator
+        maze.seed = self.seed
+        return maze
+
+
+class MazeCache:
+    """
+    Cache de génération de labyrinthes (voir le module)
+      - hits : labyrinthes trouvés en mémoire
+      - disk_hits : labyrinthes lus sur le disque
+      - misses : labyrinthes générés
+      - evictions : entrées retirées du cache en mémoire
+    """
+    def __init__(self, capacity=128, directory=None):
+        """
+        :param capacity: nombre maximal de labyrinthes gardés en mémoire
+        :param directory: dossier du cache sur disque, ou None pour un cache en mémoire seulement
+        """
+        self.capacity = capacity
+        self.directory = directory
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entrees = OrderedDict()
+        if directory is not None:
+            os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+            os.makedirs(os.path.join(directory, "keys"), exist_ok=True)
+
+    def __len__(self):
+        return len(self._entrees)
+
+    @property
+    def hit_rate(self):
+        """
+        :return: la proportion de demandes servies sans génération (mémoire ou disque)
+        """
+        demandes = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / demandes if demandes else 0.0
+
+    def clear(self):
+        """
+        Cette méthode vide le cache en mémoire (le cache sur disque est conservé)
+        :return: rien
+        """
+        self._entrees.clear()
+
+    def get(self, algorithm, h, w, seed, **params):
+        """
+        Cette méthode donne le labyrinthe produit par un générateur, en le générant si besoin
+        :param algorithm: nom du générateur ("exploration" ou "gen_exploration", "wilson", "hard_maze", ...)
+        :param h: la hauteur du labyrinthe
+        :param w: la largeur du labyrinthe
+        :param seed: graine entière (obligatoire : sans graine, le résultat n'est pas reproductible)
+        :param params: paramètres supplémentaires transmis au générateur (difficulty, end, ...)
+        :return: le labyrinthe, en lecture seule (FrozenMaze)
+        """
+        nom = algorithm if algorithm.startswith("gen_") else "gen_" + algorithm
+        if not hasattr(Maze, nom):
+            raise ValueError(f"Générateur inconnu : {algorithm}")
+        if not isinstance(seed, int):
+            raise ValueError("Le cache a besoin d'une graine entière")
+        cle = (nom, h, w, seed, tuple(sorted((k, v) for k, v in params.items() if k not in _SANS_EFFET)))
+
+        entree = self._entrees.get(cle)
+        if entree is not None:
+            self._entrees.move_to_end(cle)
+            self.hits += 1
+        else:
+            entree = self._lire(cle)
+            if entree is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                entree = self._generer(cle, params)
+            self._entrees[cle] = entree
+            if len(self._entrees) > self.capacity:
+                self._entrees.popitem(last=False)
+                self.evictions += 1
+        return self._vue(entree)
+
+    @staticmethod
+    def _vue(entree):
+        """
+        :return: une vue immuable qui partage les murs de l'entrée du cache
+        """
+        height, width, est, sud, generator, seed = entree
+        maze = FrozenMaze._from_planes(height, width, est, sud)
+        maze.generator = generator
+        maze.seed = seed
+        return maze
+
+    @staticmethod
+    def _empreinte(donnees):
+        return hashlib.sha256(donnees).hexdigest()
+
+    def _chemin_cle(self, cle):
+        return os.path.join(self.directory, "keys", self._empreinte(repr(cle).encode("utf-8")))
+
+    def _lire(self, cle):
+        """
+        :return: l'entrée lue dans le cache sur disque, ou None si elle n'y est pas
+        """
+        if self.directory is None:
+            return None
+        try:
+            with open(self._chemin_cle(cle)) as f:
+                objet = f.read().strip()
+            maze = Maze.load(os.path.join(self.directory, "objects", objet + ".maze"), mmap=False)
+        except FileNotFoundError:
+            return None
+        return self._entree(cle, maze)
+
+    def _generer(self, cle, params):
+        """
+        Génère le labyrinthe de la clé et l'enregistre sur le disque si besoin
+        :return: l'entrée correspondante
+        """
+        nom, h, w, seed, _ = cle
+        maze = getattr(Maze, nom)(h, w, seed=seed, **params)
+        if self.directory is not None:
+            # Seuls les murs sont enregistrés : le fichier ne dépend que du labyrinthe
+            tampon = io.BytesIO()
+            Maze.write_binary_stream(tampon, maze.width, maze._rows())
+            donnees = tampon.getvalue()
+            objet = self._empreinte(donnees)
+            self._ecrire(os.path.join(self.directory, "objects", objet + ".maze"), donnees)
+            self._ecrire(self._chemin_cle(cle), objet.encode("ascii"))
+        return self._entree(cle, maze)
+
+    @staticmethod
+    def _entree(cle, maze):
+        """
+        :return: l'entrée du cache : dimensions et murs du labyrinthe, générateur et graine de la clé
+        """
+        nom, _, _, seed, _ = cle
+        return maze.height, maze.width, bytes(maze._east), bytes(maze._south), nom[len("gen_"):], seed
+
+    @staticmethod
+    def _ecrire(chemin, donnees):
+        """
+        Écrit un fichier de façon atomique (fichier temporaire puis renommage),
+        pour que des processus concurrents ne lisent jamais un fichier incomplet
+        """
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, "wb") as f:
+            f.write(donnees)
+        os.replace(temporaire, chemin)
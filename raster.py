@@ -0,0 +1,222 @@
+"""
+Export des labyrinthes en images (PPM binaire et PNG)
+
+Chaque cellule occupe cell x cell pixels, séparés par des murs d'un pixel.
+Les lignes de pixels sont construites ligne de labyrinthe par ligne de labyrinthe
+à partir des tableaux de murs : pour chaque cellule, un code d'un octet
+(couleur, mur, passage coloré) est calculé pour toute la ligne à la fois par des
+opérations sur des entiers, puis traduit en segment de pixels précalculé.
+Seule une ligne de labyrinthe est en mémoire à la fois ; le PNG est compressé
+au fil de l'eau avec zlib.
+"""
+import contextlib
+import os
+import struct
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est facultatif : il accélère seulement le calcul des niveaux de la carte de chaleur
+    np = None
+
+# Indices de la palette
+MUR, SOL, CHEMIN = 0, 1, 2
+# Les niveaux de la carte de chaleur occupent les indices PREMIER_NIVEAU à 63
+PREMIER_NIVEAU = 3
+NB_NIVEAUX = 64 - PREMIER_NIVEAU
+
+# Dégradé de la carte de chaleur (du plus proche au plus éloigné)
+_DEGRADE = ((49, 54, 149), (69, 117, 180), (116, 173, 209), (254, 224, 144), (244, 109, 67), (165, 0, 38))
+
+
+def _degrade(t):
+    """
+    :param t: position dans le dégradé, entre 0 et 1
+    :return: la couleur (r, v, b) correspondante
+    """
+    x = t * (len(_DEGRADE) - 1)
+    i = min(int(x), len(_DEGRADE) - 2)
+    f = x - i
+    return tuple(round(a + (b - a) * f) for a, b in zip(_DEGRADE[i], _DEGRADE[i + 1]))
+
+
+PALETTE = ((40, 40, 40), (255, 255, 255), (220, 30, 30)) + \
+    tuple(_degrade(n / (NB_NIVEAUX - 1)) for n in range(NB_NIVEAUX))
+
+
+def _segments(cell, pixel):
+    """
+    Précalcule les segments de pixels indexés par le code d'une cellule
+    code = couleur << 2 | mur << 1 | passage, où passage indique que l'ouverture
+    vers la voisine prend la couleur de la cellule (sinon celle du sol)
+    :param cell: côté d'une cellule en pixels
+    :param pixel: fonction qui donne les octets d'un pixel à partir d'un indice de palette
+    :return: (segments des lignes de cellules : la cellule puis son mur est,
+              segments des lignes de murs : le coin puis le mur sud de la cellule)
+    """
+    mur = pixel(MUR)
+    interieur, sud = [], []
+    for code in range(256):
+        couleur, ferme, passage = code >> 2, code >> 1 & 1, code & 1
+        if couleur >= len(PALETTE):
+            couleur = SOL
+        ouverture = pixel(couleur if passage else SOL)
+        interieur.append(pixel(couleur) * cell + (mur if ferme else ouverture))
+        sud.append(mur + (mur if ferme else ouverture) * cell)
+    return interieur, sud
+
+
+def _heat_levels(heatmap):
+    """
+    Convertit des distances (une par cellule, négative si la cellule est inaccessible)
+    en indices de palette de la carte de chaleur
+    :return: un octet par cellule
+    """
+    plus_loin = max(max(heatmap, default=0), 1)
+    if np is not None:
+        valeurs = np.asarray(heatmap, dtype=np.int64)
+        niveaux = PREMIER_NIVEAU + valeurs * (NB_NIVEAUX - 1) // plus_loin
+        return np.where(valeurs < 0, SOL, niveaux).astype(np.uint8).tobytes()
+    return bytes(PREMIER_NIVEAU + d * (NB_NIVEAUX - 1) // plus_loin if d >= 0 else SOL for d in heatmap)
+
+
+def _path_rows(solution):
+    """
+    Regroupe un chemin par ligne
+    :param solution: liste de cellules consécutives (l, c)
+    :return: dictionnaire {ligne: (cellules, passages est, passages sud)}, chaque élément
+             étant un ensemble de colonnes
+    """
+    lignes = {}
+    for i, j in solution:
+        lignes.setdefault(i, (set(), set(), set()))[0].add(j)
+    for (i1, j1), (i2, j2) in zip(solution, solution[1:]):
+        if i1 == i2:
+            lignes[i1][1].add(min(j1, j2))
+        elif j1 == j2:
+            lignes[min(i1, i2)][2].add(j1)
+    return lignes
+
+
+def _codes(couleurs, murs, passages, width):
+    """
+    Calcule les codes d'une ligne (couleur << 2 | mur << 1 | passage), pour toutes
+    les cellules à la fois, par des opérations sur des entiers
+    """
+    code = int.from_bytes(couleurs, "little") << 2 | int.from_bytes(murs, "little") << 1 | \
+        int.from_bytes(passages, "little")
+    return code.to_bytes(width, "little")
+
+
+def iter_scanlines(width, rows, cell=3, solution=None, heatmap=None, rgb=False):
+    """
+    Générateur des lignes de pixels de l'image d'un labyrinthe
+    :param width: la largeur du labyrinthe
+    :param rows: itérable de couples (murs est, murs sud) d'une ligne (voir Maze.stream_rows)
+    :param cell: côté d'une cellule en pixels
+    :param solution: chemin facultatif à dessiner (liste de cellules consécutives)
+    :param heatmap: distances facultatives, une par numéro de cellule (voir Maze.distance_field)
+    :param rgb: True pour des pixels de trois octets (r, v, b), False pour des indices de palette
+    :return: les lignes de pixels, de largeur width * (cell + 1) + 1
+    """
+    pixel = (lambda indice: bytes(PALETTE[indice])) if rgb else (lambda indice: bytes((indice,)))
+    interieur, sud = _segments(cell, pixel)
+    mur = pixel(MUR)
+    niveaux = None if heatmap is None else _heat_levels(heatmap)
+    chemin = {} if solution is None else _path_rows(solution)
+    sol = bytes([SOL]) * width
+    # Sans carte de chaleur, seuls les passages du chemin prennent la couleur des cellules
+    passages_defaut = bytes([1]) * width if niveaux is not None else bytes(width)
+
+    yield mur * (width * (cell + 1) + 1)
+    for i, (est, sud_ligne) in enumerate(rows):
+        couleurs = sol if niveaux is None else niveaux[i * width:(i + 1) * width]
+        passages_est = passages_sud = passages_defaut
+        if i in chemin:
+            cellules, ponts_est, ponts_sud = chemin[i]
+            couleurs = bytearray(couleurs)
+            passages_est, passages_sud = bytearray(passages_defaut), bytearray(passages_defaut)
+            for j in cellules:
+                couleurs[j] = CHEMIN
+                passages_est[j] = passages_sud[j] = 0
+            for j in ponts_est:
+                passages_est[j] = 1
+            for j in ponts_sud:
+                passages_sud[j] = 1
+        ligne = mur + b"".join(map(interieur.__getitem__, _codes(couleurs, est, passages_est, width)))
+        for _ in range(cell):
+            yield ligne
+        yield b"".join(map(sud.__getitem__, _codes(couleurs, sud_ligne, passages_sud, width))) + mur
+
+
+def _image_size(height, width, cell):
+    return width * (cell + 1) + 1, height * (cell + 1) + 1
+
+
+@contextlib.contextmanager
+def _output(destination):
+    """
+    :param destination: chemin du fichier, ou objet fichier ouvert en écriture binaire
+    """
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "wb") as f:
+            yield f
+    else:
+        yield destination
+
+
+def write_ppm(destination, height, width, rows, cell=3, solution=None, heatmap=None):
+    """
+    Écrit l'image d'un labyrinthe au format PPM binaire (P6), ligne de pixels par ligne de pixels
+    :param destination: chemin du fichier, ou objet fichier ouvert en écriture binaire
+    :param height: la hauteur du labyrinthe
+    :param width: la largeur du labyrinthe
+    :param rows: itérable des lignes de murs (voir iter_scanlines pour les autres paramètres)
+    :return: rien
+    """
+    largeur, hauteur = _image_size(height, width, cell)
+    with _output(destination) as f:
+        f.write(b"P6\n%d %d\n255\n" % (largeur, hauteur))
+        for ligne in iter_scanlines(width, rows, cell, solution, heatmap, rgb=True):
+            f.write(ligne)
+
+
+def _chunk(f, genre, donnees):
+    f.write(struct.pack(">I", len(donnees)))
+    f.write(genre)
+    f.write(donnees)
+    f.write(struct.pack(">I", zlib.crc32(donnees, zlib.crc32(genre))))
+
+
+def write_png(destination, height, width, rows, cell=3, solution=None, heatmap=None, level=1):
+    """
+    Écrit l'image d'un labyrinthe au format PNG (couleurs indexées sur 8 bits) ;
+    les lignes de pixels sont compressées au fil de l'eau et écrites par blocs IDAT
+    :param destination: chemin du fichier, ou objet fichier ouvert en écriture binaire
+    :param height: la hauteur du labyrinthe
+    :param width: la largeur du labyrinthe
+    :param rows: itérable des lignes de murs (voir iter_scanlines pour les autres paramètres)
+    :param level: niveau de compression zlib (0 à 9) ; au-delà de 1 la compression coûte
+                  bien plus cher que la construction de l'image pour un gain de taille modeste
+    :return: rien
+    """
+    largeur, hauteur = _image_size(height, width, cell)
+    compression = zlib.compressobj(level)
+    with _output(destination) as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        _chunk(f, b"IHDR", struct.pack(">IIBBBBB", largeur, hauteur, 8, 3, 0, 0, 0))
+        _chunk(f, b"PLTE", b"".join(bytes(couleur) for couleur in PALETTE))
+        tampon = []
+        taille = 0
+        for ligne in iter_scanlines(width, rows, cell, solution, heatmap):
+            # Filtre 0 (aucun) en tête de chaque ligne de pixels
+            donnees = compression.compress(b"\x00" + ligne)
+            if donnees:
+                tampon.append(donnees)
+                taille += len(donnees)
+                if taille >= 1 << 20:
+                    _chunk(f, b"IDAT", b"".join(tampon))
+                    tampon, taille = [], 0
+        tampon.append(compression.flush())
+        _chunk(f, b"IDAT", b"".join(tampon))
+        _chunk(f, b"IEND", b"")
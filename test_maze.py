@@ -0,0 +1,85 @@
+"""
+Tests de non-régression : les labyrinthes produits doivent être parfaits (exactement h*w - 1
+passages et toutes les cellules reliées), y compris aux grandes tailles, et le format binaire
+doit toujours relire un labyrinthe valide
+"""
+import itertools
+
+import pytest
+
+from Maze import BAS, DROITE, GAUCHE, HAUT, Maze
+
+
+def passages_et_accessibles(maze):
+    """
+    Compte les passages et les cellules accessibles depuis (0, 0) à partir de Maze.adjacency,
+    indépendamment de Maze.is_perfect
+    :return: (nombre de passages, nombre de cellules accessibles)
+    """
+    w = maze.width
+    masques = maze.adjacency()
+    passages = sum(bin(m).count("1") for m in masques) // 2
+    directions = ((HAUT, -w), (BAS, w), (GAUCHE, -1), (DROITE, 1))
+    visite = bytearray(len(masques))
+    visite[0] = 1
+    pile = [0]
+    while pile:
+        k = pile.pop()
+        for bit, decalage in directions:
+            if masques[k] & bit and not visite[k + decalage]:
+                visite[k + decalage] = 1
+                pile.append(k + decalage)
+    return passages, visite.count(1)
+
+
+@pytest.mark.parametrize("h, w", [(1000, 1000), (1, 2000), (2000, 1), (1, 1)])
+def test_gen_exploration_parfait(h, w):
+    maze = Maze.gen_exploration(h, w, seed=3)
+    assert passages_et_accessibles(maze) == (h * w - 1, h * w)
+    assert maze.is_perfect()
+
+
+def test_is_perfect_detecte_boucle_et_coupure():
+    maze = Maze.gen_exploration(30, 30, seed=5)
+    c1, c2 = maze.get_walls()[0]
+    maze.remove_wall(c1, c2)
+    assert not maze.is_perfect()
+    maze.add_wall(c1, c2)
+    assert maze.is_perfect()
+    maze.add_wall((0, 0), maze.get_reachable_cells((0, 0))[0])
+    assert not maze.is_perfect()
+
+
+def test_load_modifier_save_meme_fichier(tmp_path):
+    chemin = tmp_path / "labyrinthe.maze"
+    Maze.gen_exploration(40, 30, seed=2).save(chemin)
+    maze = Maze.load(chemin)
+    c1, c2 = maze.get_walls()[0]
+    maze.remove_wall(c1, c2)
+    maze.save(chemin)
+    relu = Maze.load(chemin)
+    assert c2 in relu.get_reachable_cells(c1)
+    assert (bytes(relu._east), bytes(relu._south)) == (bytes(maze._east), bytes(maze._south))
+    assert [f.name for f in tmp_path.iterdir()] == ["labyrinthe.maze"]
+
+
+@pytest.mark.parametrize("algorithme", ["eller", "sidewinder"])
+def test_flux_sans_fin_coupe(tmp_path, algorithme):
+    chemin = tmp_path / "flux.maze"
+    lignes = itertools.islice(Maze.stream_rows(6, None, algorithme, seed=1), 5)
+    assert Maze.write_binary_stream(chemin, 6, lignes) == 5
+    maze = Maze.load(chemin)
+    assert (maze.height, maze.width) == (5, 6)
+    assert all(i < 5 for i, _ in maze.get_reachable_cells((4, 0)))
+    maze.dead_end_number()
+    maze.worst_path_len()
+
+
+def test_solve_rhr_trouve_toujours_un_chemin_existant():
+    maze = Maze.gen_wilson(15, 15, seed=4)
+    for c1, c2 in maze.get_walls()[::25]:
+        maze.remove_wall(c1, c2)
+    for depart in maze.get_cells()[::7]:
+        for arrivee in maze.get_cells()[3::11]:
+            chemin = maze.solve_rhr(depart, arrivee)
+            assert chemin[0] == depart and chemin[-1] == arrivee